@@ -0,0 +1,9 @@
+"""
+Offline performance benchmarks. Run each module with ``python -m``:
+
+- sweep_bench: /status/check-all sweep time versus service count, against stub_server targets
+- ingest_bench: error-log ingest throughput, direct or through the async queue
+- list_bench: GET /error-logs latency at 1M documents
+- serialization_bench: per-item cost of encoding a list page
+- compare: diff two ``--output`` result files and flag p95 regressions
+"""
@@ -0,0 +1,131 @@
+"""
+Shared helpers for the benchmarks: database setup, synthetic documents and
+machine-readable result output.
+
+Every benchmark accepts ``--backend mongo`` (a local MongoDB at MONGODB_URL,
+default mongodb://localhost:27017, database DB_NAME, default
+maintenance_bench) or ``--backend mock`` (mongomock_motor, in memory).
+The mock backend is for smoke runs only; its timings say nothing about
+MongoDB and it lacks text search.
+"""
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+os.environ.setdefault("MONGODB_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "maintenance_bench")
+
+from beanie import PydanticObjectId, init_beanie
+
+SEVERITIES = ["low", "medium", "high", "critical"]
+STATUSES = ["new", "acknowledged", "in_progress", "resolved", "ignored"]
+PLATFORMS = ["ios", "android", "web"]
+ENVIRONMENTS = ["development", "staging", "production"]
+SCREENS = ["Home", "Feed", "Profile", "Checkout", "Settings"]
+
+def add_backend_argument(parser, default: str = "mongo"):
+    parser.add_argument("--backend", choices=["mongo", "mock"], default=default, help="Database to run against")
+    parser.add_argument("--output", help="Also write the results as JSON to this file")
+
+async def init_database(backend: str, drop: bool = False):
+    """Initialize Beanie with every document model against the chosen backend"""
+    from src.database import DOCUMENT_MODELS
+
+    if backend == "mock":
+        from mongomock_motor import AsyncMongoMockClient
+        client = AsyncMongoMockClient()
+    else:
+        from motor.motor_asyncio import AsyncIOMotorClient
+        client = AsyncIOMotorClient(os.environ["MONGODB_URL"])
+
+    database = client[os.environ["DB_NAME"]]
+    if drop:
+        await client.drop_database(os.environ["DB_NAME"])
+    await init_beanie(database=database, document_models=DOCUMENT_MODELS)
+    return database
+
+def make_documents(count: int, start: int = 0, now: Optional[datetime] = None, seed: int = 0) -> List[Dict[str, Any]]:
+    """
+    Raw error-log documents as stored by Beanie (aliased keys), with filter
+    fields spread evenly and a realistic payload size. The same arguments
+    always produce the same documents apart from their ids.
+    """
+    now = now or datetime.now(timezone.utc).replace(microsecond=0, tzinfo=None)
+    rng = random.Random(seed + start)
+    documents = []
+    for index in range(start, start + count):
+        screen = SCREENS[index % len(SCREENS)]
+        message = f"TypeError: undefined is not an object (evaluating 'item.{index % 997}')"
+        documents.append({
+            "_id": PydanticObjectId(),
+            "message": message,
+            "messageKey": message.lower(),
+            "severity": SEVERITIES[index % len(SEVERITIES)],
+            "errorCode": f"E_{screen.upper()}",
+            "timestamp": now - timedelta(seconds=index),
+            "resolvedAt": None,
+            "appInfo": {"appVersion": "2.3.1", "buildNumber": "231", "environment": ENVIRONMENTS[index % len(ENVIRONMENTS)],
+                        "expoVersion": "51.0.0", "releaseChannel": None},
+            "deviceInfo": {"platform": PLATFORMS[index % len(PLATFORMS)], "osVersion": "17.4", "deviceModel": "iPhone15,2",
+                           "deviceId": f"device-{rng.randrange(50000)}", "manufacturer": "Apple"},
+            "userContext": {"userId": f"user-{rng.randrange(20000)}", "isAuthenticated": True},
+            "navigationContext": {"currentScreen": screen, "previousScreen": "Login", "routeParams": {"tab": "feed"}},
+            "networkInfo": {"url": "https://api.example.com/feed", "method": "GET", "statusCode": 500, "responseTime": 812.4,
+                            "requestHeaders": {"accept": "application/json"}, "responseBody": "x" * 512},
+            "status": STATUSES[index % len(STATUSES)],
+            "assignedTo": None,
+            "notes": None,
+            "fingerprint": f"{index % 997:032x}",
+            "sampleRate": None,
+            "metadata": {"component": "FeedList"}
+        })
+    return documents
+
+def percentiles(samples_ms: Sequence[float]) -> Dict[str, Any]:
+    """Nearest-rank p50/p95/p99 plus mean, min, max and count of millisecond samples"""
+    if not samples_ms:
+        return {"count": 0, "p50_ms": None, "p95_ms": None, "p99_ms": None, "mean_ms": None, "min_ms": None, "max_ms": None}
+    ordered = sorted(samples_ms)
+
+    def rank(quantile: float) -> float:
+        return round(ordered[max(0, math.ceil(quantile * len(ordered)) - 1)], 3)
+
+    return {
+        "count": len(ordered),
+        "p50_ms": rank(0.50),
+        "p95_ms": rank(0.95),
+        "p99_ms": rank(0.99),
+        "mean_ms": round(sum(ordered) / len(ordered), 3),
+        "min_ms": round(ordered[0], 3),
+        "max_ms": round(ordered[-1], 3)
+    }
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def write_results(benchmark: str, parameters: Dict[str, Any], results: Iterable[Dict[str, Any]], output: Optional[str] = None) -> Dict[str, Any]:
+    """Print a run as one JSON document and optionally write it to ``output``"""
+    report = {
+        "benchmark": benchmark,
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "commit": _git_commit(),
+        "python": sys.version.split()[0],
+        "machine": platform.machine(),
+        "parameters": parameters,
+        "results": list(results)
+    }
+    encoded = json.dumps(report, indent=2)
+    print(encoded)
+    if output:
+        with open(output, "w") as file:
+            file.write(encoded + "\n")
+    return report
@@ -0,0 +1,61 @@
+"""
+Compare two benchmark result files written with --output.
+
+Scenarios are matched by name; for each percentile the change from the
+baseline is printed, and the exit status is 1 if any p95 regressed by more
+than ``--threshold`` percent, so the script can gate a CI job.
+
+Usage: python -m benchmarks.compare baseline.json candidate.json [--threshold 10]
+"""
+import argparse
+import json
+import sys
+from typing import Any, Dict, Iterator, Tuple
+
+PERCENTILE_KEYS = ("p50_ms", "p95_ms", "p99_ms")
+
+def _percentile_sets(result: Dict[str, Any], prefix: str = "") -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Yield (name, stats) for a result's top-level and nested percentile blocks"""
+    if any(key in result for key in PERCENTILE_KEYS):
+        yield prefix or "latency", result
+    for key, value in result.items():
+        if isinstance(value, dict):
+            yield from _percentile_sets(value, key)
+
+def _load(path: str) -> Dict[str, Dict[str, Any]]:
+    with open(path) as file:
+        report = json.load(file)
+    return {result["scenario"]: result for result in report["results"]}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=10.0, help="Allowed p95 regression in percent")
+    args = parser.parse_args()
+
+    baseline, candidate = _load(args.baseline), _load(args.candidate)
+    regressed = False
+
+    for scenario in sorted(set(baseline) & set(candidate)):
+        before_sets = dict(_percentile_sets(baseline[scenario]))
+        for name, after in _percentile_sets(candidate[scenario]):
+            before = before_sets.get(name)
+            if before is None:
+                continue
+            changes = []
+            for key in PERCENTILE_KEYS:
+                if before.get(key) and after.get(key) is not None:
+                    change = (after[key] - before[key]) / before[key] * 100
+                    changes.append(f"{key[:3]} {before[key]:.2f} -> {after[key]:.2f} ({change:+.1f}%)")
+                    if key == "p95_ms" and change > args.threshold:
+                        regressed = True
+            print(f"{scenario} [{name}]: " + ", ".join(changes))
+
+    for scenario in sorted(set(baseline) ^ set(candidate)):
+        print(f"{scenario}: only in {'baseline' if scenario in baseline else 'candidate'}")
+
+    sys.exit(1 if regressed else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Error-log ingest throughput through ingest_error_logs (the POST /error-logs
+and /error-logs/batch path, including fingerprinting, grouping and sampling).
+
+``--mode sync`` calls ingest_error_logs directly with ``--concurrency``
+writers; ``--mode queue`` submits single logs to the async ingest queue and
+waits for it to drain, like ERROR_LOG_INGEST_MODE=async. The collections
+are dropped first so every run starts from the same state.
+
+Usage: python -m benchmarks.ingest_bench [--total 100000] [--batch-size 500]
+                                         [--concurrency 4] [--mode sync|queue]
+                                         [--backend mongo|mock] [--output ingest.json]
+"""
+import argparse
+import asyncio
+import time
+from benchmarks.common import add_backend_argument, init_database, make_documents, percentiles, write_results
+
+def build_error_logs(count: int, start: int):
+    from src.models.error_log import ErrorLog
+
+    error_logs = []
+    for document in make_documents(count, start=start):
+        document.pop("_id")
+        # Let ingest fingerprint and group the logs like client traffic
+        document.pop("fingerprint")
+        error_logs.append(ErrorLog.model_validate(document))
+    return error_logs
+
+async def ingest_sync(args):
+    from src.utils.error_ingest import ingest_error_logs
+
+    batch_ms = []
+    failed = 0
+    starts = iter(range(0, args.total, args.batch_size))
+
+    async def writer():
+        nonlocal failed
+        for start in starts:
+            error_logs = build_error_logs(min(args.batch_size, args.total - start), start)
+            batch_start = time.perf_counter()
+            write_errors, _ = await ingest_error_logs(error_logs)
+            batch_ms.append((time.perf_counter() - batch_start) * 1000)
+            failed += len(write_errors)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(writer() for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - started
+    return {"batch": percentiles(batch_ms), "failed": failed}, elapsed
+
+async def ingest_queue_mode(args):
+    from src.utils.ingest_queue import ErrorLogIngestQueue
+
+    queue = ErrorLogIngestQueue(maxsize=args.total, workers=args.concurrency, batch_size=args.batch_size)
+    await queue.start()
+    error_logs = []
+    for start in range(0, args.total, args.batch_size):
+        error_logs.extend(build_error_logs(min(args.batch_size, args.total - start), start))
+
+    started = time.perf_counter()
+    submit_ms = []
+    for error_log in error_logs:
+        submit_start = time.perf_counter()
+        queue.submit(error_log)
+        submit_ms.append((time.perf_counter() - submit_start) * 1000)
+    await queue.stop()
+    elapsed = time.perf_counter() - started
+    return {"submit": percentiles(submit_ms), **queue.stats()}, elapsed
+
+async def run(args):
+    await init_database(args.backend, drop=True)
+    measured, elapsed = await (ingest_sync(args) if args.mode == "sync" else ingest_queue_mode(args))
+
+    from src.models.error_group import ErrorGroup
+    groups = await ErrorGroup.get_motor_collection().count_documents({})
+
+    write_results("error_log_ingest", {
+        key: value for key, value in vars(args).items() if key != "output"
+    }, [{
+        "scenario": f"ingest_{args.mode}",
+        "documents": args.total,
+        "elapsed_s": round(elapsed, 3),
+        "docs_per_second": round(args.total / elapsed, 1),
+        "groups": groups,
+        **measured
+    }], args.output)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--total", type=int, default=100000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=4, help="Concurrent writers, or queue workers")
+    parser.add_argument("--mode", choices=["sync", "queue"], default="sync")
+    add_backend_argument(parser)
+    asyncio.run(run(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
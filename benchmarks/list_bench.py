@@ -0,0 +1,121 @@
+"""
+End-to-end latency of GET /error-logs list queries at a realistic size.
+
+Seeds ``--documents`` synthetic error logs (1M by default, reused across
+runs when the collection already holds that many) and calls the route
+through the ASGI app in process, so routing, validation, the MongoDB query
+and serialization are all measured without a network hop. The response
+cache is disabled unless ``--response-cache`` is given; the revalidation
+scenario measures the 304 path on its own.
+
+Usage: python -m benchmarks.list_bench [--documents 1000000] [--requests 200]
+                                       [--backend mongo|mock] [--reseed]
+                                       [--response-cache] [--output list.json]
+"""
+import argparse
+import asyncio
+import time
+from typing import Any, Dict, List, Tuple
+from benchmarks.common import add_backend_argument, init_database, make_documents, percentiles, write_results
+
+SEED_CHUNK = 10000
+
+SCENARIOS: List[Tuple[str, Dict[str, Any]]] = [
+    ("first_page", {}),
+    ("first_page_summary", {"fields": "summary"}),
+    ("first_page_estimated_total", {"totalMode": "estimated"}),
+    ("first_page_no_total", {"totalMode": "none"}),
+    ("severity_filter", {"severity": "critical"}),
+    ("platform_environment_filter", {"platform": "ios", "environment": "production"}),
+    ("page_100_skip", {"page": 100, "totalMode": "none"}),
+    ("text_search", {"q": "undefined item", "totalMode": "none"}),
+    ("prefix_search", {"q": "TypeError: undef", "searchMode": "prefix", "totalMode": "none"})
+]
+
+async def seed(documents: int, reseed: bool):
+    from src.models.error_log import ErrorLog
+
+    collection = ErrorLog.get_motor_collection()
+    existing = await collection.estimated_document_count()
+    if existing >= documents and not reseed:
+        return existing
+
+    await collection.delete_many({})
+    for start in range(0, documents, SEED_CHUNK):
+        await collection.insert_many(make_documents(min(SEED_CHUNK, documents - start), start=start), ordered=False)
+    return documents
+
+async def timed_get(client, params) -> Tuple[float, Any]:
+    start = time.perf_counter()
+    response = await client.get("/error-logs", params=params)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    response.raise_for_status()
+    return elapsed_ms, response
+
+async def run_scenario(client, params, requests: int) -> Dict[str, Any]:
+    await timed_get(client, params)
+    samples = [(await timed_get(client, params))[0] for _ in range(requests)]
+    return percentiles(samples)
+
+async def run_cursor_walk(client, pages: int) -> Dict[str, Any]:
+    """Follow nextCursor page after page, as deep scrolling clients do"""
+    samples = []
+    params = {"totalMode": "none"}
+    for _ in range(pages):
+        elapsed_ms, response = await timed_get(client, params)
+        samples.append(elapsed_ms)
+        next_cursor = response.json()["nextCursor"]
+        if not next_cursor:
+            break
+        params = {"totalMode": "none", "cursor": next_cursor}
+    return percentiles(samples)
+
+async def run_revalidation(client, requests: int) -> Dict[str, Any]:
+    _, response = await timed_get(client, {})
+    headers = {"If-None-Match": response.headers["etag"]}
+    samples = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        revalidated = await client.get("/error-logs", headers=headers)
+        samples.append((time.perf_counter() - start) * 1000)
+        assert revalidated.status_code == 304, revalidated.status_code
+    return percentiles(samples)
+
+async def run(args):
+    import httpx
+    from src.config import settings
+    from src.main import app
+
+    if not args.response_cache:
+        settings.RESPONSE_CACHE_TTL = 0
+
+    await init_database(args.backend)
+    documents = await seed(args.documents, args.reseed)
+
+    results = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for name, params in SCENARIOS:
+            try:
+                results.append({"scenario": name, "params": params, **(await run_scenario(client, params, args.requests))})
+            except Exception as e:
+                results.append({"scenario": name, "params": params, "error": str(e)})
+        results.append({"scenario": "cursor_walk", **(await run_cursor_walk(client, args.requests))})
+        results.append({"scenario": "revalidate_304", **(await run_revalidation(client, args.requests))})
+
+    write_results("error_log_list", {
+        **{key: value for key, value in vars(args).items() if key != "output"},
+        "seeded_documents": documents
+    }, results, args.output)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--documents", type=int, default=1_000_000)
+    parser.add_argument("--requests", type=int, default=200, help="Timed requests per scenario")
+    parser.add_argument("--reseed", action="store_true", help="Replace existing documents even if there are enough")
+    parser.add_argument("--response-cache", action="store_true", help="Keep the in-process response cache enabled")
+    add_backend_argument(parser)
+    asyncio.run(run(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
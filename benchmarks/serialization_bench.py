@@ -0,0 +1,78 @@
+"""
+Per-item cost of serializing an error-log list page.
+
+"before" is the model path the list endpoints used: Beanie model
+validation of each raw document, error_log_to_response, then FastAPI's
+response_model round trip (dump, validate, dump to JSON). "after" is the
+raw path: raw document -> document_to_response -> orjson.
+
+Usage: python -m benchmarks.serialization_bench [--items 100] [--rounds 200]
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+from benchmarks.common import make_documents
+
+from beanie import init_beanie
+from src.models.error_log import ErrorLog
+from src.routes.error_logs import ERROR_LOG_RESPONSE_KEYS, ErrorLogListResponse, error_log_to_response
+from src.utils.serialization import document_to_response, dumps
+
+def serialize_before(documents):
+    error_logs = [ErrorLog.model_validate(document) for document in documents]
+    response = ErrorLogListResponse(
+        total=len(documents), page=1, page_size=len(documents),
+        data=[error_log_to_response(error_log) for error_log in error_logs]
+    )
+    # What FastAPI does with a returned model and a response_model
+    content = response.model_dump(by_alias=True)
+    validated = ErrorLogListResponse.model_validate(content)
+    return json.dumps(validated.model_dump(mode="json", by_alias=True)).encode()
+
+def serialize_after(documents):
+    return dumps({
+        "total": len(documents), "totalMode": "exact", "page": 1, "pageSize": len(documents), "nextCursor": None,
+        "data": [document_to_response(document, ERROR_LOG_RESPONSE_KEYS) for document in documents]
+    })
+
+def measure(function, documents, rounds):
+    function(documents)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        function(documents)
+    elapsed = time.perf_counter() - start
+    return elapsed / (rounds * len(documents)) * 1e6
+
+async def init_models():
+    try:
+        from mongomock_motor import AsyncMongoMockClient
+        client = AsyncMongoMockClient()
+    except ImportError:
+        from motor.motor_asyncio import AsyncIOMotorClient
+        client = AsyncIOMotorClient(os.environ["MONGODB_URL"])
+    await init_beanie(database=client[os.environ["DB_NAME"]], document_models=[ErrorLog])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--items", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    asyncio.run(init_models())
+    documents = make_documents(args.items)
+
+    before = measure(serialize_before, documents, args.rounds)
+    after = measure(serialize_after, documents, args.rounds)
+    print(json.dumps({
+        "benchmark": "error_log_list_serialization",
+        "items": args.items,
+        "rounds": args.rounds,
+        "before_us_per_item": round(before, 2),
+        "after_us_per_item": round(after, 2),
+        "speedup": round(before / after, 2)
+    }))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Local HTTP/1.1 probe targets with configurable latency, failures and hangs.
+
+Each request path gets a deterministic outcome stream, so two runs with
+the same seed see the same sequence of slow, failing and hanging targets.
+A hanging request never gets a response, which exercises the checker's
+timeout path.
+
+Usage: python -m benchmarks.stub_server [--port 8081] [--latency-ms 20] [--jitter-ms 5]
+                                        [--failure-rate 0.05] [--timeout-rate 0.01]
+"""
+import argparse
+import asyncio
+import random
+import zlib
+from typing import Dict, Optional, Set
+
+class StubServer:
+    def __init__(
+        self,
+        latency_ms: float = 20.0,
+        jitter_ms: float = 5.0,
+        failure_rate: float = 0.0,
+        timeout_rate: float = 0.0,
+        seed: int = 0
+    ):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.failure_rate = failure_rate
+        self.timeout_rate = timeout_rate
+        self.seed = seed
+        self.port: Optional[int] = None
+        self.requests = 0
+
+        self._server: Optional[asyncio.base_events.Server] = None
+        self._rngs: Dict[str, random.Random] = {}
+        self._handlers: Set[asyncio.Task] = set()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        self._server = await asyncio.start_server(self._handle, host, port, backlog=4096)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self.port
+
+    async def stop(self):
+        if self._server is None:
+            return
+        self._server.close()
+        for task in self._handlers:
+            task.cancel()
+        await asyncio.gather(*self._handlers, return_exceptions=True)
+        await self._server.wait_closed()
+        self._server = None
+
+    def url(self, index: int) -> str:
+        return f"http://127.0.0.1:{self.port}/services/{index}"
+
+    def _outcome(self, path: str):
+        rng = self._rngs.get(path)
+        if rng is None:
+            rng = self._rngs[path] = random.Random(self.seed * 1_000_003 + zlib.crc32(path.encode()))
+        roll = rng.random()
+        delay = max(0.0, rng.gauss(self.latency_ms, self.jitter_ms)) / 1000 if self.jitter_ms else self.latency_ms / 1000
+        if roll < self.timeout_rate:
+            return None, delay
+        if roll < self.timeout_rate + self.failure_rate:
+            return 503, delay
+        return 200, delay
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        task = asyncio.current_task()
+        self._handlers.add(task)
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    return
+                self.requests += 1
+                path = head.split(b" ", 2)[1].decode()
+                code, delay = self._outcome(path)
+                if code is None:
+                    # Hang until the client gives up and closes the connection
+                    await reader.read()
+                    return
+                await asyncio.sleep(delay)
+                body = b'{"ok":true}' if code == 200 else b'{"ok":false}'
+                writer.write(
+                    b"HTTP/1.1 %d %s\r\nContent-Type: application/json\r\nContent-Length: %d\r\n\r\n%s"
+                    % (code, b"OK" if code == 200 else b"Service Unavailable", len(body), body)
+                )
+                await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            return
+        finally:
+            self._handlers.discard(task)
+            writer.close()
+
+async def _serve(args):
+    server = StubServer(args.latency_ms, args.jitter_ms, args.failure_rate, args.timeout_rate, args.seed)
+    port = await server.start(port=args.port)
+    print(f"Stub targets listening on http://127.0.0.1:{port}/services/<n>")
+    await asyncio.Event().wait()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--jitter-ms", type=float, default=5.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--timeout-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    try:
+        asyncio.run(_serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
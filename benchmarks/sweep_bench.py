@@ -0,0 +1,86 @@
+"""
+Sweep time versus service count for run_probe_sweep (the /status/check-all path).
+
+Probes go to local stub targets (see stub_server), so the run is offline
+and repeatable. For each service count the sweep runs ``--rounds`` times;
+results report sweep duration and per-probe latency percentiles. Probes
+run under the probe policy (adaptive timeouts, retries, circuit breaker)
+unless --force is given, which still retries but ignores open circuits.
+
+Usage: python -m benchmarks.sweep_bench [--services 10,100,1000] [--rounds 5]
+                                        [--latency-ms 50] [--jitter-ms 20]
+                                        [--failure-rate 0.02] [--timeout-rate 0.01]
+                                        [--timeout 2] [--concurrency 50] [--force]
+                                        [--output sweep.json]
+"""
+import argparse
+import asyncio
+from beanie import PydanticObjectId
+from benchmarks.common import add_backend_argument, init_database, percentiles, write_results
+from benchmarks.stub_server import StubServer
+
+async def run(args):
+    from src.models.service import Service
+    from src.utils.checker import close_http_client, init_http_client
+    from src.utils.probe_engine import run_probe_sweep
+
+    await init_database(args.backend)
+    server = StubServer(args.latency_ms, args.jitter_ms, args.failure_rate, args.timeout_rate, args.seed)
+    await server.start()
+    await init_http_client()
+
+    results = []
+    try:
+        for count in args.services:
+            services = [
+                Service(id=PydanticObjectId(), name=f"stub-{index}", url=server.url(index), check_timeout=args.timeout)
+                for index in range(count)
+            ]
+            # Warm the connection pool so the first round is not all handshakes
+            await run_probe_sweep(services, concurrency=args.concurrency, force=args.force)
+
+            sweep_ms, probe_ms = [], []
+            down = timed_out = circuit_open = 0
+            for _ in range(args.rounds):
+                sweep = await run_probe_sweep(services, concurrency=args.concurrency, force=args.force)
+                sweep_ms.append(sweep["duration_ms"])
+                timed_out += sweep["timed_out"]
+                circuit_open += len(sweep["circuit_open"])
+                for result in sweep["results"]:
+                    probe_ms.append(result["latency_ms"])
+                    down += result["status"] == "down"
+
+            results.append({
+                "scenario": f"sweep_{count}_services",
+                "services": count,
+                "sweep": percentiles(sweep_ms),
+                "probe": percentiles(probe_ms),
+                "down_ratio": round(down / len(probe_ms), 4) if probe_ms else None,
+                "deadline_exceeded": timed_out,
+                "circuit_open": circuit_open
+            })
+    finally:
+        await close_http_client()
+        await server.stop()
+
+    write_results("probe_sweep", {
+        key: value for key, value in vars(args).items() if key != "output"
+    }, results, args.output)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--services", type=lambda value: [int(count) for count in value.split(",")], default=[10, 100, 1000])
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--jitter-ms", type=float, default=20.0)
+    parser.add_argument("--failure-rate", type=float, default=0.02)
+    parser.add_argument("--timeout-rate", type=float, default=0.01)
+    parser.add_argument("--timeout", type=float, default=2.0, help="Per-service check timeout (the adaptive timeout's ceiling)")
+    parser.add_argument("--force", action="store_true", help="Probe services with an open circuit too")
+    parser.add_argument("--concurrency", type=int, default=None, help="Defaults to PROBE_CONCURRENCY")
+    parser.add_argument("--seed", type=int, default=0)
+    add_backend_argument(parser, default="mock")
+    asyncio.run(run(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
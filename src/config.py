@@ -1,4 +1,5 @@
 from pydantic_settings import BaseSettings
+from typing import Dict
 
 class Settings(BaseSettings):
     MONGODB_URL: str
@@ -6,6 +7,77 @@ class Settings(BaseSettings):
     PORT: int = 8000
     CORS_ORIGINS: str = "*"
     REQUEST_TIMEOUT: int = 10
+    PROBE_CONCURRENCY: int = 50
+    SWEEP_DEADLINE: float = 60.0
+    ADAPTIVE_TIMEOUTS_ENABLED: bool = True
+    PROBE_TIMEOUT_FLOOR: float = 0.5
+    PROBE_TIMEOUT_MULTIPLIER: float = 3.0
+    PROBE_LATENCY_HISTORY: int = 50
+    PROBE_LATENCY_MIN_SAMPLES: int = 10
+    PROBE_RETRIES: int = 1
+    PROBE_RETRY_DELAY: float = 0.2
+    PROBE_HEDGE_ENABLED: bool = False
+    CIRCUIT_BREAKER_ENABLED: bool = True
+    CIRCUIT_FAILURE_THRESHOLD: int = 3
+    CIRCUIT_BASE_BACKOFF: float = 30.0
+    CIRCUIT_MAX_BACKOFF: float = 900.0
+    SCHEDULER_ENABLED: bool = False
+    CHECK_INTERVAL: float = 60.0
+    SCHEDULER_JITTER: float = 0.1
+    SCHEDULER_CONCURRENCY: int = 50
+    SCHEDULER_REFRESH_INTERVAL: float = 30.0
+    SHARDING_ENABLED: bool = False
+    SHARD_COUNT: int = 64
+    LEASE_TTL: float = 30.0
+    LEASE_RENEW_INTERVAL: float = 10.0
+    STATUS_BUFFER_BATCH_SIZE: int = 500
+    STATUS_BUFFER_FLUSH_INTERVAL: float = 1.0
+    STATUS_BUFFER_MAX_PENDING: int = 50000
+    STATUS_BUFFER_OVERFLOW_POLICY: str = "drop_oldest"
+    ESTIMATED_COUNT_LIMIT: int = 10000
+    STATUS_RETENTION_DAYS: float = 30
+    ROLLUP_MINUTE_RETENTION_DAYS: float = 7
+    ROLLUP_HOUR_RETENTION_DAYS: float = 90
+    ROLLUP_DAY_RETENTION_DAYS: float = 0
+    ROLLUP_MAX_POINTS: int = 500
+    ANALYTICS_CACHE_TTL: float = 60.0
+    ERROR_LOG_BATCH_MAX_ITEMS: int = 1000
+    ERROR_GROUP_SAMPLE_SIZE: int = 20
+    ERROR_GROUP_RAW_LIMIT: int = 100
+    ERROR_GROUP_RAW_WINDOW: float = 3600.0
+    ERROR_LOG_INGEST_MODE: str = "sync"
+    ERROR_LOG_QUEUE_MAX_SIZE: int = 10000
+    ERROR_LOG_QUEUE_WORKERS: int = 2
+    ERROR_LOG_QUEUE_BATCH_SIZE: int = 500
+    ERROR_LOG_QUEUE_BATCH_WAIT: float = 0.05
+    ERROR_LOG_QUEUE_DRAIN_TIMEOUT: float = 10.0
+    ERROR_SAMPLING_ENABLED: bool = False
+    ERROR_SAMPLING_WINDOW: float = 60.0
+    ERROR_SAMPLING_MAX_KEYS: int = 100000
+    ERROR_SAMPLING_RULES: Dict[str, Dict[str, int]] = {
+        "critical": {"keep_first": 0, "keep_every": 1},
+        "high": {"keep_first": 100, "keep_every": 10},
+        "medium": {"keep_first": 50, "keep_every": 20},
+        "low": {"keep_first": 10, "keep_every": 100}
+    }
+    SERVICE_REGISTRY_POLL_INTERVAL: float = 5.0
+    BACKFILL_SEARCH_KEYS_ON_STARTUP: bool = False
+    FACETS_CACHE_TTL: float = 10.0
+    EVENTS_BUFFER_SIZE: int = 100
+    EVENTS_MAX_SUBSCRIBERS: int = 1000
+    EVENTS_KEEPALIVE_INTERVAL: float = 15.0
+    EVENTS_SOURCE: str = "auto"
+    EVENTS_POLL_INTERVAL: float = 1.0
+    EVENTS_POLL_LOOKBACK: float = 60.0
+    RESPONSE_CACHE_TTL: float = 5.0
+    RESPONSE_CACHE_MAX_ENTRIES: int = 1024
+    VERSION_BUMP_INTERVAL: float = 1.0
+    METRICS_ENABLED: bool = True
+    EXPLAIN_QUERIES_ON_STARTUP: bool = False
+    HTTP2_ENABLED: bool = True
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0
 
     class Config:
         env_file = ".env"
@@ -4,17 +4,32 @@ from src.config import settings
 from src.models.service import Service
 from src.models.status import Status
 from src.models.error_log import ErrorLog
+from src.models.latest_status import LatestStatus
+from src.models.status_rollup import StatusRollup
+from src.models.error_group import ErrorGroup, ErrorGroupMember
+from src.models.collection_version import CollectionVersion
+from src.models.lease import Lease
+from src.utils.rollups import ensure_status_retention
+from src.utils.metrics import MongoCommandMetrics
+
+DOCUMENT_MODELS = [
+    Service,
+    Status,
+    LatestStatus,
+    StatusRollup,
+    ErrorLog,
+    ErrorGroup,
+    ErrorGroupMember,
+    CollectionVersion,
+    Lease
+]
 
 async def init_db():
-    client = AsyncIOMotorClient(settings.MONGODB_URL)
+    event_listeners = [MongoCommandMetrics()] if settings.METRICS_ENABLED else []
+    client = AsyncIOMotorClient(settings.MONGODB_URL, event_listeners=event_listeners)
 
     database = client[settings.DB_NAME]
 
-    await init_beanie(
-        database=database,
-        document_models=[
-            Service,
-            Status,
-            ErrorLog
-        ]
-    )
\ No newline at end of file
+    await init_beanie(database=database, document_models=DOCUMENT_MODELS)
+
+    await ensure_status_retention()
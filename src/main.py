@@ -2,15 +2,51 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 from src.database import init_db
+from src.utils.checker import init_http_client, close_http_client
+from src.utils.scheduler import scheduler
+from src.utils.status_buffer import status_buffer
+from src.utils.latest_status import rebuild_latest_statuses, sync_latest_services
+from src.utils.query_plan import check_list_query_plans
+from src.utils.ingest_queue import ingest_queue
+from src.utils.service_registry import service_registry
+from src.utils.search import backfill_message_keys
+from src.utils.events import event_poller, events_polled, seed_last_statuses
+from src.utils.sharding import shard_manager
 from src.config import settings
-from src.routes import services, status, error_logs
+from src.utils.metrics import MetricsMiddleware
+from src.routes import services, status, error_logs, events, metrics
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await init_db()
     print("Database initialized successfully")
+    await rebuild_latest_statuses()
+    await seed_last_statuses()
+    if settings.BACKFILL_SEARCH_KEYS_ON_STARTUP:
+        print(f"Backfilled search keys on {await backfill_message_keys()} error logs")
+    if settings.EXPLAIN_QUERIES_ON_STARTUP:
+        await check_list_query_plans()
+    await service_registry.start()
+    await sync_latest_services(await service_registry.all())
+    await init_http_client()
+    await status_buffer.start()
+    if events_polled():
+        await event_poller.start()
+    if settings.ERROR_LOG_INGEST_MODE == "async":
+        await ingest_queue.start()
+    if settings.SCHEDULER_ENABLED:
+        await shard_manager.start()
+        await scheduler.start()
+        print("Health check scheduler started")
     yield
     print("Shutting down...")
+    await scheduler.stop()
+    await shard_manager.stop()
+    await status_buffer.stop()
+    await ingest_queue.stop()
+    await event_poller.stop()
+    await close_http_client()
+    await service_registry.stop()
 
 app = FastAPI(
     title="Maintenance Server API",
@@ -25,11 +61,16 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
 
 app.include_router(services.router)
 app.include_router(status.router)
 app.include_router(error_logs.router)
+app.include_router(events.router)
+app.include_router(metrics.router)
 
 @app.get("/", tags=["Health"])
 async def health_check():
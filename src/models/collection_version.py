@@ -0,0 +1,9 @@
+from beanie import Document, Indexed
+
+class CollectionVersion(Document):
+    """Change counter for a collection, bumped by every write handler"""
+    collection: Indexed(str, unique=True)
+    version: int = 0
+
+    class Settings:
+        name = "collection_versions"
@@ -0,0 +1,62 @@
+from beanie import Document, Indexed
+from datetime import datetime
+from pydantic import BaseModel, Field
+from pymongo import IndexModel, ASCENDING, DESCENDING
+from typing import Literal, Optional, List
+
+class ErrorGroupSample(BaseModel):
+    error_log_id: str = Field(..., alias="errorLogId")
+    timestamp: datetime
+    device_id: Optional[str] = Field(None, alias="deviceId")
+    user_id: Optional[str] = Field(None, alias="userId")
+
+    class Config:
+        populate_by_name = True
+
+class ErrorGroup(Document):
+    fingerprint: Indexed(str, unique=True)
+    message: str
+    severity: Literal['low', 'medium', 'high', 'critical']
+    error_code: Optional[str] = Field(None, alias="errorCode")
+    current_screen: Optional[str] = Field(None, alias="currentScreen")
+    app_version: Optional[str] = Field(None, alias="appVersion")
+    environment: Optional[Literal['development', 'staging', 'production']] = None
+    # Stored as "count"; a field of that name would shadow Document.count()
+    occurrences: int = Field(0, alias="count")
+    first_seen: datetime = Field(..., alias="firstSeen")
+    last_seen: datetime = Field(..., alias="lastSeen")
+    affected_devices: int = Field(0, alias="affectedDevices")
+    affected_users: int = Field(0, alias="affectedUsers")
+    # Occurrences stored as raw error logs in the current window, capped at
+    # ERROR_GROUP_RAW_LIMIT per ERROR_GROUP_RAW_WINDOW
+    raw_stored: int = Field(0, alias="rawStored")
+    raw_window_start: Optional[datetime] = Field(None, alias="rawWindowStart")
+    samples: List[ErrorGroupSample] = Field(default_factory=list)
+
+    class Settings:
+        name = "error_groups"
+        indexes = [
+            IndexModel([("lastSeen", DESCENDING), ("_id", DESCENDING)], name="last_seen"),
+            IndexModel([("count", DESCENDING), ("_id", DESCENDING)], name="count"),
+            IndexModel([("severity", ASCENDING), ("lastSeen", DESCENDING)], name="severity_last_seen")
+        ]
+
+    class Config:
+        populate_by_name = True
+
+class ErrorGroupMember(Document):
+    """One distinct device or user seen for an error group"""
+    fingerprint: str
+    kind: Literal['device', 'user']
+    member_id: str
+    first_seen: datetime
+
+    class Settings:
+        name = "error_group_members"
+        indexes = [
+            IndexModel(
+                [("fingerprint", ASCENDING), ("kind", ASCENDING), ("member_id", ASCENDING)],
+                name="fingerprint_kind_member",
+                unique=True
+            )
+        ]
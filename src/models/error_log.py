@@ -2,6 +2,7 @@ from beanie import Document
 from datetime import datetime
 from pydantic import BaseModel, Field
 from typing import Literal, Optional, Dict, Any, List
+from pymongo import IndexModel, ASCENDING, DESCENDING, TEXT
 
 class AppInfo(BaseModel):
     app_version: str = Field(..., alias="appVersion")
@@ -66,10 +67,27 @@ class ErrorLog(Document):
     assigned_to: Optional[str] = Field(None, alias="assignedTo")
     notes: Optional[List[str]] = None
     fingerprint: Optional[str] = None
+    sample_rate: Optional[float] = Field(None, alias="sampleRate")
+    message_key: Optional[str] = Field(None, alias="messageKey")
     metadata: Optional[Dict[str, Any]] = None
 
     class Settings:
         name = "error_logs"
+        # Documents are stored by alias, so nested paths use the camelCase names
+        indexes = [
+            IndexModel([("timestamp", DESCENDING), ("_id", DESCENDING)], name="timestamp"),
+            IndexModel([("severity", ASCENDING), ("timestamp", DESCENDING), ("_id", DESCENDING)], name="severity_timestamp"),
+            IndexModel([("status", ASCENDING), ("timestamp", DESCENDING), ("_id", DESCENDING)], name="status_timestamp"),
+            IndexModel([("deviceInfo.platform", ASCENDING), ("timestamp", DESCENDING), ("_id", DESCENDING)], name="platform_timestamp"),
+            IndexModel([("appInfo.environment", ASCENDING), ("timestamp", DESCENDING), ("_id", DESCENDING)], name="environment_timestamp"),
+            IndexModel([("assignedTo", ASCENDING), ("timestamp", DESCENDING), ("_id", DESCENDING)], name="assigned_to_timestamp"),
+            IndexModel(
+                [("message", TEXT), ("errorCode", TEXT), ("navigationContext.currentScreen", TEXT)],
+                name="message_text",
+                weights={"message": 10, "errorCode": 5, "navigationContext.currentScreen": 1}
+            ),
+            IndexModel([("messageKey", ASCENDING), ("timestamp", DESCENDING), ("_id", DESCENDING)], name="message_key")
+        ]
 
     class Config:
         populate_by_name = True
@@ -0,0 +1,18 @@
+from beanie import Document, Indexed
+from datetime import datetime
+
+class LatestStatus(Document):
+    service_id: Indexed(str, unique=True)
+    service_name: str | None = None
+    # The status fields stay empty (status "unknown") until the first check
+    status_id: str | None = None
+    status: str
+    latency_ms: float | None = None
+    connect_ms: float | None = None
+    ttfb_ms: float | None = None
+    response_code: int | None = None
+    error_message: str | None = None
+    timestamp: datetime | None = None
+
+    class Settings:
+        name = "latest_statuses"
@@ -0,0 +1,29 @@
+from beanie import Document, Indexed
+from datetime import datetime
+from pymongo import IndexModel, ASCENDING
+
+# How long an expired worker lease is kept before MongoDB deletes it
+WORKER_LEASE_RETENTION_SECONDS = 3600
+
+class Lease(Document):
+    """
+    A time-limited claim held by one worker: either a shard of the service
+    set ("shard") or the worker's own liveness record ("worker")
+    """
+    name: Indexed(str, unique=True)
+    kind: Indexed(str)
+    shard: int | None = None
+    owner: str | None = None
+    expires_at: datetime
+
+    class Settings:
+        name = "leases"
+        indexes = [
+            # Every process start adds a worker lease; drop those of workers long gone
+            IndexModel(
+                [("expires_at", ASCENDING)],
+                name="worker_expires_at_ttl",
+                expireAfterSeconds=WORKER_LEASE_RETENTION_SECONDS,
+                partialFilterExpression={"kind": "worker"}
+            )
+        ]
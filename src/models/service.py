@@ -6,6 +6,8 @@ class Service(Document):
     name: str
     url: str
     metadata: dict | None = None
+    check_interval: float | None = None
+    check_timeout: float | None = None
     created_at: datetime = Field(default_factory=datetime.now)
     updated_at: datetime = Field(default_factory=datetime.now)
 
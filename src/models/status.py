@@ -1,14 +1,21 @@
 from beanie import Document
 from datetime import datetime
 from pydantic import Field
+from pymongo import IndexModel, ASCENDING, DESCENDING
 
 class Status(Document):
     status: str
     service_id: str
     latency_ms: float
+    connect_ms: float | None = None
+    ttfb_ms: float | None = None
     response_code: int | None = None
     error_message: str | None = None
     timestamp: datetime = Field(default_factory=datetime.now)
 
     class Settings:
-        name = "statuses"
\ No newline at end of file
+        name = "statuses"
+        indexes = [
+            IndexModel([("service_id", ASCENDING), ("timestamp", DESCENDING), ("_id", DESCENDING)], name="service_id_timestamp"),
+            IndexModel([("timestamp", DESCENDING), ("_id", DESCENDING)], name="timestamp")
+        ]
\ No newline at end of file
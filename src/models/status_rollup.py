@@ -0,0 +1,31 @@
+from beanie import Document
+from datetime import datetime
+from typing import Dict, Literal
+from pydantic import Field
+from pymongo import IndexModel, ASCENDING
+
+class StatusRollup(Document):
+    service_id: str
+    granularity: Literal['minute', 'hour', 'day']
+    bucket_start: datetime
+    # Stored as "count"; a field of that name would shadow Document.count()
+    checks: int = Field(0, alias="count")
+    up: int = 0
+    down: int = 0
+    # Latency aggregates cover successful ("up") checks only
+    latency_sum: float = 0.0
+    latency_min: float | None = None
+    latency_max: float | None = None
+    latency_histogram: Dict[str, int] = Field(default_factory=dict)
+    expires_at: datetime | None = None
+
+    class Settings:
+        name = "status_rollups"
+        indexes = [
+            IndexModel(
+                [("service_id", ASCENDING), ("granularity", ASCENDING), ("bucket_start", ASCENDING)],
+                name="service_granularity_bucket",
+                unique=True
+            ),
+            IndexModel([("expires_at", ASCENDING)], name="expires_at_ttl", expireAfterSeconds=0)
+        ]
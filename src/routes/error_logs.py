@@ -1,10 +1,25 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import JSONResponse
 from typing import List, Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ValidationError
 from src.models.error_log import ErrorLog, AppInfo, DeviceInfo, UserContext, NavigationContext, NetworkInfo
+from src.models.error_group import ErrorGroup, ErrorGroupSample
+from src.utils.pagination import KEYSET_SORT, apply_cursor, encode_cursor
+from src.utils.serialization import document_to_response, response_keys
+from src.utils.projection import mongo_projection, parse_fields
+from src.utils.export import export_response
+from src.utils.search import message_search_key, search_query
+from src.utils.cache import TTLCache
+from src.utils.error_ingest import ERROR_LOGS_COLLECTION, ingest_error_logs
+from src.utils.conditional import conditional_json
+from src.utils.versions import bump_version, get_version
+from src.utils.ingest_queue import ingest_queue
+from src.utils.sampling import error_sampler
+from src.config import settings
 from beanie import PydanticObjectId
 from datetime import datetime
-from typing import Literal, Dict, Any
+from typing import Literal, Dict, Any, Tuple
+import json
 
 router = APIRouter(prefix="/error-logs", tags=["Error Logs"])
 
@@ -53,20 +68,97 @@ class ErrorLogResponse(BaseModel):
     assigned_to: Optional[str] = Field(None, alias="assignedTo")
     notes: Optional[List[str]] = None
     fingerprint: Optional[str] = None
+    sample_rate: Optional[float] = Field(None, alias="sampleRate")
     metadata: Optional[Dict[str, Any]] = None
 
     class Config:
         populate_by_name = True
 
 class ErrorLogListResponse(BaseModel):
-    total: int
+    total: Optional[int]
+    total_mode: Literal['exact', 'estimated', 'none'] = Field('exact', alias="totalMode")
+    # True when an estimated total stopped counting at ESTIMATED_COUNT_LIMIT
+    total_capped: bool = Field(False, alias="totalCapped")
     page: int
     page_size: int = Field(..., alias="pageSize")
+    next_cursor: Optional[str] = Field(None, alias="nextCursor")
     data: List[ErrorLogResponse]
 
     class Config:
         populate_by_name = True
 
+class ErrorLogBatchItemResult(BaseModel):
+    index: int
+    status: Literal['created', 'invalid', 'failed', 'sampled_out']
+    id: Optional[str] = None
+    errors: Optional[List[str]] = None
+
+class ErrorLogBatchResponse(BaseModel):
+    received: int
+    created: int
+    invalid: int
+    failed: int
+    sampled_out: int = Field(0, alias="sampledOut")
+    results: List[ErrorLogBatchItemResult]
+
+    class Config:
+        populate_by_name = True
+
+class ErrorGroupResponse(BaseModel):
+    fingerprint: str
+    message: str
+    severity: Literal['low', 'medium', 'high', 'critical']
+    error_code: Optional[str] = Field(None, alias="errorCode")
+    current_screen: Optional[str] = Field(None, alias="currentScreen")
+    app_version: Optional[str] = Field(None, alias="appVersion")
+    environment: Optional[Literal['development', 'staging', 'production']] = None
+    count: int
+    first_seen: str = Field(..., alias="firstSeen")
+    last_seen: str = Field(..., alias="lastSeen")
+    affected_devices: int = Field(..., alias="affectedDevices")
+    affected_users: int = Field(..., alias="affectedUsers")
+    samples: List[ErrorGroupSample]
+
+    class Config:
+        populate_by_name = True
+
+class ErrorGroupListResponse(BaseModel):
+    total: int
+    page: int
+    page_size: int = Field(..., alias="pageSize")
+    data: List[ErrorGroupResponse]
+
+    class Config:
+        populate_by_name = True
+
+class ErrorLogAcceptedResponse(BaseModel):
+    id: Optional[str] = None
+    status: Literal['queued', 'sampled_out']
+    fingerprint: Optional[str] = None
+
+class FacetCount(BaseModel):
+    value: Optional[str]
+    count: int
+
+class ErrorLogFacetsResponse(BaseModel):
+    total: int
+    severity: List[FacetCount]
+    status: List[FacetCount]
+    platform: List[FacetCount]
+    environment: List[FacetCount]
+    app_version: List[FacetCount] = Field(..., alias="appVersion")
+
+    class Config:
+        populate_by_name = True
+
+class BatchParseError(str):
+    """Marks an NDJSON line that could not be decoded"""
+
+ERROR_LOG_RESPONSE_KEYS = response_keys(ErrorLogResponse)
+ERROR_LOG_FIELD_PRESETS = {
+    "summary": ["id", "message", "severity", "errorCode", "status", "timestamp", "assignedTo", "fingerprint"]
+}
+
 def error_log_to_response(error_log: ErrorLog) -> ErrorLogResponse:
     return ErrorLogResponse(
         id=str(error_log.id),
@@ -84,13 +176,76 @@ def error_log_to_response(error_log: ErrorLog) -> ErrorLogResponse:
         assigned_to=error_log.assigned_to,
         notes=error_log.notes,
         fingerprint=error_log.fingerprint,
+        sample_rate=error_log.sample_rate,
         metadata=error_log.metadata
     )
 
-@router.post("", response_model=ErrorLogResponse, status_code=201)
-async def create_error_log(error_data: ErrorLogCreate):
-    """Create a new error log"""
-    error_log = ErrorLog(
+def build_error_log_filters(
+    severity: Optional[str] = None,
+    status: Optional[str] = None,
+    platform: Optional[str] = None,
+    environment: Optional[str] = None,
+    assigned_to: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None
+) -> Dict[str, Any]:
+    """Mongo filter for the error-log list filters, on the stored (aliased) field names"""
+    query_filters: Dict[str, Any] = {}
+    
+    if severity:
+        query_filters['severity'] = severity
+    if status:
+        query_filters['status'] = status
+    if platform:
+        query_filters['deviceInfo.platform'] = platform
+    if environment:
+        query_filters['appInfo.environment'] = environment
+    if assigned_to:
+        query_filters['assignedTo'] = assigned_to
+    if start or end:
+        query_filters['timestamp'] = {}
+        if start:
+            query_filters['timestamp']['$gte'] = start
+        if end:
+            query_filters['timestamp']['$lt'] = end
+    
+    return query_filters
+
+async def count_error_logs(query_filters: Dict[str, Any], total_mode: str) -> Tuple[Optional[int], bool]:
+    """
+    Count matching error logs exactly, approximately or not at all. Returns
+    the total and whether it is a lower bound: an estimate with filters is
+    an exact count that stops at ESTIMATED_COUNT_LIMIT.
+    """
+    if total_mode == 'none':
+        return None, False
+    collection = ErrorLog.get_motor_collection()
+    if total_mode == 'estimated':
+        if not query_filters:
+            return await collection.estimated_document_count(), False
+        total = await collection.count_documents(query_filters, limit=settings.ESTIMATED_COUNT_LIMIT)
+        return total, total >= settings.ESTIMATED_COUNT_LIMIT
+    return await collection.count_documents(query_filters), False
+
+def error_group_to_response(group: ErrorGroup) -> ErrorGroupResponse:
+    return ErrorGroupResponse(
+        fingerprint=group.fingerprint,
+        message=group.message,
+        severity=group.severity,
+        error_code=group.error_code,
+        current_screen=group.current_screen,
+        app_version=group.app_version,
+        environment=group.environment,
+        count=group.occurrences,
+        first_seen=group.first_seen.isoformat(),
+        last_seen=group.last_seen.isoformat(),
+        affected_devices=group.affected_devices,
+        affected_users=group.affected_users,
+        samples=group.samples
+    )
+
+def build_error_log(error_data: ErrorLogCreate) -> ErrorLog:
+    return ErrorLog(
         message=error_data.message,
         severity=error_data.severity,
         error_code=error_data.error_code,
@@ -101,12 +256,255 @@ async def create_error_log(error_data: ErrorLogCreate):
         navigation_context=error_data.navigation_context,
         network_info=error_data.network_info,
         fingerprint=error_data.fingerprint,
+        message_key=message_search_key(error_data.message),
         metadata=error_data.metadata
     )
-    await error_log.insert()
+
+def parse_batch_body(body: bytes, content_type: str) -> List[Any]:
+    """Parse a JSON array or an NDJSON stream into a list of raw items"""
+    if "ndjson" in content_type or "jsonlines" in content_type:
+        items = []
+        for line_number, line in enumerate(body.splitlines(), start=1):
+            if not line.strip():
+                continue
+            try:
+                items.append(json.loads(line))
+            except ValueError as e:
+                # Keep the slot so result indexes still line up with input lines
+                items.append(BatchParseError(f"Line {line_number}: {str(e)}"))
+        return items
+
+    try:
+        items = json.loads(body)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid JSON: {str(e)}")
+    if not isinstance(items, list):
+        raise HTTPException(status_code=400, detail="Expected a JSON array of error logs")
+    return items
+
+@router.post(
+    "",
+    response_model=ErrorLogResponse,
+    status_code=201,
+    responses={202: {"model": ErrorLogAcceptedResponse}, 503: {"description": "Ingest queue is full"}}
+)
+async def create_error_log(error_data: ErrorLogCreate):
+    """
+    Create a new error log. In async ingest mode the log is queued and
+    202 is returned right away; 503 means the queue is full. An occurrence
+    dropped by storm sampling or past its group's raw storage limit is
+    counted on its error group and answered with 202 as well.
+    """
+    error_log = build_error_log(error_data)
+
+    if ingest_queue.running:
+        if not ingest_queue.submit(error_log):
+            raise HTTPException(
+                status_code=503,
+                detail="Error log ingest queue is full",
+                headers={"Retry-After": "1"}
+            )
+        return JSONResponse(
+            status_code=202,
+            content=ErrorLogAcceptedResponse(id=str(error_log.id), status="queued").model_dump()
+        )
+
+    write_errors, sampled_out = await ingest_error_logs([error_log])
+    if write_errors:
+        raise HTTPException(status_code=500, detail=f"Failed to store error log: {write_errors[0]}")
+    if sampled_out:
+        return JSONResponse(
+            status_code=202,
+            content=ErrorLogAcceptedResponse(status="sampled_out", fingerprint=error_log.fingerprint).model_dump()
+        )
     
     return error_log_to_response(error_log)
 
+@router.post("/batch", response_model=ErrorLogBatchResponse)
+async def create_error_logs_batch(request: Request):
+    """
+    Create many error logs from a JSON array or an NDJSON body
+    (Content-Type: application/x-ndjson). Each item is validated and
+    reported on its own, so one bad record does not reject the batch.
+    """
+    items = parse_batch_body(await request.body(), request.headers.get("content-type", ""))
+    if len(items) > settings.ERROR_LOG_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch exceeds {settings.ERROR_LOG_BATCH_MAX_ITEMS} items"
+        )
+
+    results: List[Optional[ErrorLogBatchItemResult]] = [None] * len(items)
+    error_logs: List[ErrorLog] = []
+    positions: List[int] = []
+
+    for index, item in enumerate(items):
+        if isinstance(item, BatchParseError):
+            results[index] = ErrorLogBatchItemResult(index=index, status="invalid", errors=[str(item)])
+            continue
+        try:
+            error_data = ErrorLogCreate.model_validate(item)
+        except ValidationError as e:
+            results[index] = ErrorLogBatchItemResult(
+                index=index,
+                status="invalid",
+                errors=[f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in e.errors()]
+            )
+            continue
+        error_logs.append(build_error_log(error_data))
+        positions.append(index)
+
+    write_errors, sampled_out = await ingest_error_logs(error_logs)
+
+    for position, (index, error_log) in enumerate(zip(positions, error_logs)):
+        if position in sampled_out:
+            results[index] = ErrorLogBatchItemResult(index=index, status="sampled_out")
+        elif position in write_errors:
+            results[index] = ErrorLogBatchItemResult(index=index, status="failed", errors=[write_errors[position]])
+        else:
+            results[index] = ErrorLogBatchItemResult(index=index, status="created", id=str(error_log.id))
+
+    return ErrorLogBatchResponse(
+        received=len(items),
+        created=sum(1 for result in results if result.status == "created"),
+        invalid=sum(1 for result in results if result.status == "invalid"),
+        failed=sum(1 for result in results if result.status == "failed"),
+        sampled_out=sum(1 for result in results if result.status == "sampled_out"),
+        results=results
+    )
+
+@router.get("/export")
+async def export_error_logs(
+    export_format: Literal['ndjson', 'csv'] = Query('ndjson', alias="format", description="Output format"),
+    gzip: bool = Query(False, description="Compress the export with gzip"),
+    severity: Optional[Literal['low', 'medium', 'high', 'critical']] = None,
+    status: Optional[Literal['new', 'acknowledged', 'in_progress', 'resolved', 'ignored']] = None,
+    platform: Optional[Literal['ios', 'android', 'web']] = None,
+    environment: Optional[Literal['development', 'staging', 'production']] = None,
+    assigned_to: Optional[str] = Query(None, alias="assignedTo"),
+    start: Optional[datetime] = Query(None, description="Only logs at or after this time"),
+    end: Optional[datetime] = Query(None, description="Only logs before this time"),
+    fields: Optional[str] = Query(None, description="Comma-separated response keys to export, or 'summary'")
+):
+    """Stream every matching error log, newest first, as NDJSON or CSV"""
+    try:
+        keys = parse_fields(fields, ERROR_LOG_RESPONSE_KEYS, ERROR_LOG_FIELD_PRESETS)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    query_filters = build_error_log_filters(severity, status, platform, environment, assigned_to, start, end)
+    cursor = ErrorLog.get_motor_collection().find(query_filters, mongo_projection(keys)).sort(KEYSET_SORT)
+
+    return export_response(cursor, keys, export_format, gzip, "error-logs")
+
+# Facet name -> stored field path
+ERROR_LOG_FACETS = {
+    "severity": "severity",
+    "status": "status",
+    "platform": "deviceInfo.platform",
+    "environment": "appInfo.environment",
+    "app_version": "appInfo.appVersion"
+}
+ERROR_LOG_FACET_LIMIT = 50
+
+facets_cache = TTLCache(maxsize=512, ttl=settings.FACETS_CACHE_TTL)
+
+@router.get("/facets", response_model=ErrorLogFacetsResponse)
+async def get_error_log_facets(
+    severity: Optional[Literal['low', 'medium', 'high', 'critical']] = None,
+    status: Optional[Literal['new', 'acknowledged', 'in_progress', 'resolved', 'ignored']] = None,
+    platform: Optional[Literal['ios', 'android', 'web']] = None,
+    environment: Optional[Literal['development', 'staging', 'production']] = None,
+    assigned_to: Optional[str] = Query(None, alias="assignedTo"),
+    start: Optional[datetime] = Query(None, description="Only logs at or after this time"),
+    end: Optional[datetime] = Query(None, description="Only logs before this time"),
+    q: Optional[str] = Query(None, min_length=1, description="Search error messages, codes and screens"),
+    search_mode: Literal['text', 'prefix'] = Query('text', alias="searchMode", description="text: relevance-ranked words; prefix: message typeahead")
+):
+    """
+    Get error-log counts by severity, status, platform, environment and app
+    version in one aggregation. Takes the same filters and search as the list,
+    so the counts describe the logs it returns.
+    """
+    cache_key = (severity, status, platform, environment, assigned_to, start, end, q, search_mode)
+    cached = facets_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    query_filters = build_error_log_filters(severity, status, platform, environment, assigned_to, start, end)
+    if q:
+        query_filters = {**query_filters, **search_query(q, search_mode)[0]}
+    pipeline = [
+        {"$match": query_filters},
+        {"$facet": {
+            "total": [{"$count": "count"}],
+            **{
+                facet: [
+                    {"$group": {"_id": f"${path}", "count": {"$sum": 1}}},
+                    {"$sort": {"count": -1, "_id": 1}},
+                    {"$limit": ERROR_LOG_FACET_LIMIT}
+                ]
+                for facet, path in ERROR_LOG_FACETS.items()
+            }
+        }}
+    ]
+    result = await ErrorLog.get_motor_collection().aggregate(pipeline).to_list(length=1)
+    result = result[0] if result else {}
+
+    facets = ErrorLogFacetsResponse(
+        total=result["total"][0]["count"] if result.get("total") else 0,
+        **{
+            facet: [FacetCount(value=row["_id"], count=row["count"]) for row in result.get(facet, [])]
+            for facet in ERROR_LOG_FACETS
+        }
+    )
+    facets_cache.set(cache_key, facets)
+    return facets
+
+@router.get("/ingest/stats")
+async def get_ingest_stats():
+    """Get depth, drop and latency counters of the async ingest queue and sampler"""
+    return {
+        "mode": settings.ERROR_LOG_INGEST_MODE,
+        **ingest_queue.stats(),
+        "sampling": {"enabled": settings.ERROR_SAMPLING_ENABLED, **error_sampler.stats()}
+    }
+
+@router.get("/groups", response_model=ErrorGroupListResponse)
+async def get_error_groups(
+    page: int = Query(1, ge=1, description="Page number"),
+    page_size: int = Query(20, ge=1, le=100, description="Items per page", alias="pageSize"),
+    sort: Literal['lastSeen', 'count'] = Query('lastSeen', description="Sort order, descending"),
+    severity: Optional[Literal['low', 'medium', 'high', 'critical']] = None,
+    environment: Optional[Literal['development', 'staging', 'production']] = None
+):
+    """Get error groups (one per distinct fingerprint) with occurrence counts"""
+    query_filters = {}
+
+    if severity:
+        query_filters['severity'] = severity
+    if environment:
+        query_filters['environment'] = environment
+
+    total = await ErrorGroup.get_motor_collection().count_documents(query_filters)
+    groups = await ErrorGroup.find(query_filters).sort(f"-{sort}", "-_id").skip((page - 1) * page_size).limit(page_size).to_list()
+
+    return ErrorGroupListResponse(
+        total=total,
+        page=page,
+        page_size=page_size,
+        data=[error_group_to_response(group) for group in groups]
+    )
+
+@router.get("/groups/{fingerprint}", response_model=ErrorGroupResponse)
+async def get_error_group(fingerprint: str):
+    """Get a single error group by fingerprint"""
+    group = await ErrorGroup.find_one(ErrorGroup.fingerprint == fingerprint)
+    if not group:
+        raise HTTPException(status_code=404, detail="Error group not found")
+
+    return error_group_to_response(group)
+
 @router.get("/{error_log_id}", response_model=ErrorLogResponse)
 async def get_error_log(error_log_id: str):
     """Get a single error log by ID"""
@@ -121,46 +519,67 @@ async def get_error_log(error_log_id: str):
 
 @router.get("", response_model=ErrorLogListResponse)
 async def get_error_logs(
+    request: Request,
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(20, ge=1, le=100, description="Items per page", alias="pageSize"),
     severity: Optional[Literal['low', 'medium', 'high', 'critical']] = None,
     status: Optional[Literal['new', 'acknowledged', 'in_progress', 'resolved', 'ignored']] = None,
     platform: Optional[Literal['ios', 'android', 'web']] = None,
     environment: Optional[Literal['development', 'staging', 'production']] = None,
-    assigned_to: Optional[str] = Query(None, alias="assignedTo")
+    assigned_to: Optional[str] = Query(None, alias="assignedTo"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's nextCursor; takes precedence over page"),
+    total_mode: Literal['exact', 'estimated', 'none'] = Query('exact', alias="totalMode", description="How to compute total"),
+    fields: Optional[str] = Query(None, description="Comma-separated response keys to return, or 'summary'"),
+    q: Optional[str] = Query(None, min_length=1, description="Search error messages, codes and screens"),
+    search_mode: Literal['text', 'prefix'] = Query('text', alias="searchMode", description="text: relevance-ranked words; prefix: message typeahead")
 ):
-    """Get all error logs with pagination and filtering"""
-    query_filters = {}
-    
-    if severity:
-        query_filters['severity'] = severity
-    if status:
-        query_filters['status'] = status
-    if platform:
-        query_filters['device_info.platform'] = platform
-    if environment:
-        query_filters['app_info.environment'] = environment
-    if assigned_to:
-        query_filters['assigned_to'] = assigned_to
-    
-    if query_filters:
-        total = await ErrorLog.find(query_filters).count()
-    else:
-        total = await ErrorLog.find_all().count()
-    
-    skip = (page - 1) * page_size
-    
-    if query_filters:
-        error_logs = await ErrorLog.find(query_filters).skip(skip).limit(page_size).to_list()
-    else:
-        error_logs = await ErrorLog.find_all().skip(skip).limit(page_size).to_list()
+    """
+    Get all error logs, newest first, with page or cursor pagination and filtering.
+    With q, results are ordered by relevance (text) or by message (prefix) and
+    paged with page only. Supports If-None-Match revalidation.
+    """
+    query_filters = build_error_log_filters(severity, status, platform, environment, assigned_to)
+    sort = KEYSET_SORT
+    extra_projection = {}
+
+    if q:
+        if cursor:
+            raise HTTPException(status_code=400, detail="cursor cannot be combined with q; use page")
+        search_filter, extra_projection, sort = search_query(q, search_mode)
+        query_filters = {**query_filters, **search_filter}
     
-    return ErrorLogListResponse(
-        total=total,
-        page=page,
-        page_size=page_size,
-        data=[error_log_to_response(log) for log in error_logs]
-    )
+    try:
+        keys = parse_fields(fields, ERROR_LOG_RESPONSE_KEYS, ERROR_LOG_FIELD_PRESETS)
+        page_filters = apply_cursor(query_filters, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    async def build_page():
+        total, total_capped = await count_error_logs(query_filters, total_mode)
+
+        # Raw documents go straight to JSON; see serialization.document_to_response
+        projection = {**mongo_projection(keys, always=["_id", "timestamp"]), **extra_projection}
+        query = ErrorLog.get_motor_collection().find(page_filters, projection).sort(sort)
+        if not cursor:
+            query = query.skip((page - 1) * page_size)
+        documents = await query.limit(page_size + 1).to_list(length=page_size + 1)
+
+        next_cursor = None
+        if len(documents) > page_size and not q:
+            next_cursor = encode_cursor(documents[page_size - 1]["timestamp"], documents[page_size - 1]["_id"])
+        documents = documents[:page_size]
+
+        return {
+            "total": total,
+            "totalMode": total_mode,
+            "totalCapped": total_capped,
+            "page": page,
+            "pageSize": page_size,
+            "nextCursor": next_cursor,
+            "data": [document_to_response(document, keys) for document in documents]
+        }
+
+    return await conditional_json(request, await get_version(ERROR_LOGS_COLLECTION), build_page)
 
 @router.patch("/{error_log_id}", response_model=ErrorLogResponse)
 async def update_error_log(error_log_id: str, update_data: ErrorLogUpdate):
@@ -180,6 +599,7 @@ async def update_error_log(error_log_id: str, update_data: ErrorLogUpdate):
             error_log.resolved_at = update_data.resolved_at
         
         await error_log.save()
+        await bump_version(ERROR_LOGS_COLLECTION)
         
         return error_log_to_response(error_log)
     except HTTPException:
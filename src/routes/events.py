@@ -0,0 +1,58 @@
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from typing import List, Literal
+from src.utils.broadcaster import broadcaster
+from src.utils.events import STATUS_TOPIC, ERROR_LOG_TOPIC
+from src.utils.serialization import dumps
+from src.config import settings
+
+router = APIRouter(prefix="/events", tags=["Events"])
+
+def format_event(event_id: int, topic: str, data: dict) -> bytes:
+    return b"id: %d\nevent: %s\ndata: %s\n\n" % (event_id, topic.encode(), dumps(data))
+
+@router.get("")
+async def stream_events(
+    request: Request,
+    topics: List[Literal['status', 'error_log']] = Query([STATUS_TOPIC, ERROR_LOG_TOPIC], description="Event types to receive")
+):
+    """
+    Server-sent events for service status transitions (status) and new
+    high/critical error logs (error_log). A "lagged" event reports how many
+    events were dropped because this client read too slowly.
+
+    By default each worker publishes the writes it made itself, which needs a
+    single worker or clients pinned to the worker probing their services.
+    With EVENTS_SOURCE=poll (the "auto" default once sharding is enabled)
+    every worker reads events back from MongoDB, about EVENTS_POLL_INTERVAL
+    seconds late.
+    """
+    subscription = broadcaster.subscribe(set(topics))
+    if subscription is None:
+        raise HTTPException(status_code=503, detail="Too many event subscribers", headers={"Retry-After": "5"})
+
+    async def body():
+        try:
+            yield b"retry: 3000\n\n"
+            while not await request.is_disconnected():
+                event = await subscription.next(timeout=settings.EVENTS_KEEPALIVE_INTERVAL)
+                dropped = subscription.take_dropped()
+                if dropped:
+                    yield b"event: lagged\ndata: %s\n\n" % dumps({"dropped": dropped})
+                if event is None:
+                    yield b": keepalive\n\n"
+                else:
+                    yield format_event(*event)
+        finally:
+            broadcaster.unsubscribe(subscription)
+
+    return StreamingResponse(
+        body(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.get("/stats")
+async def get_event_stats():
+    """Get subscriber and publish counters of the event broadcaster"""
+    return broadcaster.stats()
@@ -0,0 +1,22 @@
+from fastapi import APIRouter, Response
+from src.utils.metrics import registry
+from src.utils.status_buffer import status_buffer
+from src.utils.ingest_queue import ingest_queue
+from src.utils.scheduler import scheduler
+from src.utils.broadcaster import broadcaster
+from src.utils.sharding import shard_manager
+
+router = APIRouter(tags=["Metrics"])
+
+registry.gauge("status_buffer_pending", "Status records waiting to be written", lambda: status_buffer.stats()["pending"])
+registry.counter_function("status_buffer_dropped_total", "Status records dropped by the write buffer", lambda: status_buffer.stats()["dropped"])
+registry.gauge("error_log_queue_depth", "Error logs waiting in the async ingest queue", lambda: ingest_queue.stats()["depth"])
+registry.gauge("scheduler_queue_depth", "Services scheduled for a health check", lambda: scheduler.stats()["queue_depth"])
+registry.gauge("scheduler_lag_seconds", "How far behind schedule the most overdue health check is", lambda: scheduler.stats()["current_lag_ms"] / 1000)
+registry.gauge("shards_owned", "Health check shards leased by this worker", lambda: len(shard_manager.owned_shards))
+registry.gauge("event_subscribers", "Connected server-sent event clients", lambda: broadcaster.stats()["subscribers"])
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    """Prometheus text exposition of the in-process metrics"""
+    return Response(content=registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -1,7 +1,14 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Request
 from typing import List
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from src.models.service import Service
+from src.utils.latest_status import delete_latest_status, register_latest_service
+from src.utils.serialization import response_keys
+from src.utils.projection import parse_fields
+from src.utils.service_registry import service_registry
+from src.utils.events import forget_service
+from src.utils.probe_policy import probe_policy
+from src.utils.conditional import conditional_json
 from beanie import PydanticObjectId
 
 router = APIRouter(prefix="/services", tags=["Services"])
@@ -10,35 +17,48 @@ class ServiceCreate(BaseModel):
     name: str
     url: str
     metadata: dict | None = None
+    check_interval: float | None = Field(default=None, gt=0)
+    check_timeout: float | None = Field(default=None, gt=0)
 
 class ServiceUpdate(BaseModel):
     name: str | None = None
     url: str | None = None
     metadata: dict | None = None
+    check_interval: float | None = Field(default=None, gt=0)
+    check_timeout: float | None = Field(default=None, gt=0)
 
 class ServiceResponse(BaseModel):
     id: str
     name: str
     url: str
     metadata: dict | None = None
+    check_interval: float | None = None
+    check_timeout: float | None = None
     created_at: str
     updated_at: str
 
+SERVICE_RESPONSE_KEYS = response_keys(ServiceResponse)
+SERVICE_FIELD_PRESETS = {
+    "summary": ["id", "name", "url"]
+}
+
 @router.get("", response_model=List[ServiceResponse])
-async def get_all_services():
-    """Get all services"""
-    services = await Service.find_all().to_list()
-    return [
-        ServiceResponse(
-            id=str(service.id),
-            name=service.name,
-            url=service.url,
-            metadata=service.metadata,
-            created_at=service.created_at.isoformat(),
-            updated_at=service.updated_at.isoformat()
-        )
-        for service in services
-    ]
+async def get_all_services(
+    request: Request,
+    fields: str | None = Query(default=None, description="Comma-separated response keys to return, or 'summary'")
+):
+    """Get all services; supports If-None-Match revalidation"""
+    try:
+        keys = parse_fields(fields, SERVICE_RESPONSE_KEYS, SERVICE_FIELD_PRESETS)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    services = await service_registry.all_dicts()
+
+    async def build_services():
+        return [{key: service[key] for key in keys} for service in services]
+
+    return await conditional_json(request, service_registry.version, build_services)
 
 @router.get("/{service_id}", response_model=ServiceResponse)
 async def get_service(service_id: str):
@@ -53,6 +73,8 @@ async def get_service(service_id: str):
             name=service.name,
             url=service.url,
             metadata=service.metadata,
+            check_interval=service.check_interval,
+            check_timeout=service.check_timeout,
             created_at=service.created_at.isoformat(),
             updated_at=service.updated_at.isoformat()
         )
@@ -65,15 +87,21 @@ async def create_service(service_data: ServiceCreate):
     service = Service(
         name=service_data.name,
         url=service_data.url,
-        metadata=service_data.metadata
+        metadata=service_data.metadata,
+        check_interval=service_data.check_interval,
+        check_timeout=service_data.check_timeout
     )
     await service.insert()
+    await service_registry.upsert(service)
+    await register_latest_service(service)
     
     return ServiceResponse(
         id=str(service.id),
         name=service.name,
         url=service.url,
         metadata=service.metadata,
+        check_interval=service.check_interval,
+        check_timeout=service.check_timeout,
         created_at=service.created_at.isoformat(),
         updated_at=service.updated_at.isoformat()
     )
@@ -92,16 +120,25 @@ async def update_service(service_id: str, service_data: ServiceUpdate):
             service.url = service_data.url
         if service_data.metadata is not None:
             service.metadata = service_data.metadata
+        if service_data.check_interval is not None:
+            service.check_interval = service_data.check_interval
+        if service_data.check_timeout is not None:
+            service.check_timeout = service_data.check_timeout
         
         from datetime import datetime
         service.updated_at = datetime.now()
         await service.save()
+        await service_registry.upsert(service)
+        if service_data.name is not None:
+            await register_latest_service(service)
         
         return ServiceResponse(
             id=str(service.id),
             name=service.name,
             url=service.url,
             metadata=service.metadata,
+            check_interval=service.check_interval,
+            check_timeout=service.check_timeout,
             created_at=service.created_at.isoformat(),
             updated_at=service.updated_at.isoformat()
         )
@@ -119,6 +156,10 @@ async def delete_service(service_id: str):
             raise HTTPException(status_code=404, detail="Service not found")
         
         await service.delete()
+        await delete_latest_status(service_id)
+        await service_registry.remove(service_id)
+        forget_service(service_id)
+        probe_policy.forget(service_id)
         return None
     except HTTPException:
         raise
@@ -1,11 +1,24 @@
-from fastapi import APIRouter, HTTPException, Query
-from typing import List
+from fastapi import APIRouter, HTTPException, Query, Request
+from typing import List, Literal
 from pydantic import BaseModel
-from src.models.service import Service
 from src.models.status import Status
-from src.utils.checker import check_service_status
-from src.config import settings
-from datetime import datetime
+from src.models.latest_status import LatestStatus
+from src.utils.probe_engine import run_probe_sweep, status_from_result
+from src.utils.scheduler import scheduler
+from src.utils.probe_policy import probe_policy
+from src.utils.sharding import shard_manager
+from src.utils.status_buffer import status_buffer
+from src.utils.pagination import KEYSET_SORT, apply_cursor, encode_cursor
+from src.utils.serialization import document_to_response, json_response, response_keys
+from src.utils.projection import mongo_projection, parse_fields
+from src.utils.export import export_response
+from src.utils.service_registry import service_registry
+from src.utils.rollups import choose_granularity, find_rollups, summarize_rollup
+from src.utils.analytics import compute_analytics
+from src.utils.latest_status import LATEST_STATUSES_COLLECTION
+from src.utils.conditional import conditional_json
+from src.utils.versions import get_version
+from datetime import datetime, timedelta
 import asyncio
 
 router = APIRouter(prefix="/status", tags=["Status"])
@@ -15,53 +28,121 @@ class StatusResponse(BaseModel):
     service_id: str
     status: str
     latency_ms: float
+    connect_ms: float | None = None
+    ttfb_ms: float | None = None
     response_code: int | None
     error_message: str | None
     timestamp: str
 
+STATUS_RESPONSE_KEYS = response_keys(StatusResponse)
+STATUS_FIELD_PRESETS = {
+    "summary": ["id", "service_id", "status", "latency_ms", "timestamp"]
+}
+
+class LatestStatusResponse(BaseModel):
+    id: str | None = None
+    service_id: str
+    service_name: str
+    status: str
+    latency_ms: float | None = None
+    connect_ms: float | None = None
+    ttfb_ms: float | None = None
+    response_code: int | None = None
+    error_message: str | None = None
+    timestamp: str | None = None
+
+class RollupBucketResponse(BaseModel):
+    bucket_start: str
+    count: int
+    up: int
+    down: int
+    uptime_pct: float | None
+    latency_min: float | None
+    latency_avg: float | None
+    latency_max: float | None
+    latency_p50: float | None
+    latency_p95: float | None
+    latency_p99: float | None
+
+class RollupListResponse(BaseModel):
+    service_id: str
+    granularity: str
+    start: str
+    end: str
+    buckets: List[RollupBucketResponse]
+
+class ServiceAnalyticsResponse(BaseModel):
+    service_id: str
+    checks: int
+    up: int
+    down: int
+    uptime_pct: float | None
+    latency_min: float | None
+    latency_avg: float | None
+    latency_max: float | None
+    latency_p50: float | None
+    latency_p95: float | None
+    latency_p99: float | None
+    incident_count: int
+    ongoing_incident: bool
+    ongoing_at_start: bool
+    mttr_seconds: float | None
+
+class AnalyticsResponse(BaseModel):
+    start: str
+    end: str
+    granularity: str
+    services: List[ServiceAnalyticsResponse]
+
 class CheckAllResponse(BaseModel):
     message: str
     checked_services: int
+    duration_ms: float
+    timed_out: int
+    circuit_open: List[str]
     results: List[StatusResponse]
 
 @router.get("/check-all", response_model=CheckAllResponse)
-async def check_all_services():
+async def check_all_services(
+    force: bool = Query(default=False, description="Also probe services whose circuit breaker is open")
+):
     """
-    Fetch all services, check their status, and store results in database
+    Fetch all services, check their status concurrently, and store results in database.
+    Services with an open circuit are skipped and listed in circuit_open unless force is set.
+    This always sweeps every service, whichever worker's shard it is in.
     """
-    services = await Service.find_all().to_list()
+    services = await service_registry.all()
     
     if not services:
         raise HTTPException(status_code=404, detail="No services found")
     
-    results = []
-    
-    for service in services:
-        status_data = await check_service_status(service.url, settings.REQUEST_TIMEOUT)
-
-        status_record = Status(
-            service_id=str(service.id),
-            status=status_data["status"],
-            latency_ms=status_data["latency_ms"],
-            response_code=status_data["response_code"],
-            error_message=status_data["error_message"]
-        )
+    sweep = await run_probe_sweep(services, force=force)
 
-        await status_record.insert()
-        
-        results.append(StatusResponse(
+    status_records = [status_from_result(status_data) for status_data in sweep["results"]]
+
+    status_buffer.add_many(status_records)
+
+    results = [
+        StatusResponse(
             id=str(status_record.id),
-            service_id=str(service.id),
+            service_id=status_record.service_id,
             status=status_record.status,
             latency_ms=status_record.latency_ms,
+            connect_ms=status_record.connect_ms,
+            ttfb_ms=status_record.ttfb_ms,
             response_code=status_record.response_code,
             error_message=status_record.error_message,
             timestamp=status_record.timestamp.isoformat()
-        ))
+        )
+        for status_record in status_records
+    ]
     
     return CheckAllResponse(
-        message=f"Successfully checked {len(services)} services",
-        checked_services=len(services),
+        message=f"Successfully checked {len(results)} services",
+        checked_services=len(results),
+        duration_ms=sweep["duration_ms"],
+        timed_out=sweep["timed_out"],
+        circuit_open=sweep["circuit_open"],
         results=results
     )
 
@@ -69,56 +150,93 @@ async def check_all_services():
 async def get_status_logs(
     limit: int = Query(default=50, ge=1, le=1000, description="Number of records to return"),
     offset: int = Query(default=0, ge=0, description="Number of records to skip"),
-    service_id: str | None = Query(default=None, description="Filter by service ID")
+    service_id: str | None = Query(default=None, description="Filter by service ID"),
+    cursor: str | None = Query(default=None, description="Opaque cursor from a previous X-Next-Cursor header; takes precedence over offset"),
+    fields: str | None = Query(default=None, description="Comma-separated response keys to return, or 'summary'")
 ):
     """
-    Get status logs with pagination and optional filtering by service_id
+    Get status logs with offset or cursor pagination and optional filtering by service_id.
+    The cursor for the next page is returned in the X-Next-Cursor header.
     """
-    if service_id:
-        query = Status.find(Status.service_id == service_id)
-    else:
-        query = Status.find_all()
+    query_filters = {"service_id": service_id} if service_id else {}
+
+    try:
+        keys = parse_fields(fields, STATUS_RESPONSE_KEYS, STATUS_FIELD_PRESETS)
+        query_filters = apply_cursor(query_filters, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    projection = mongo_projection(keys, always=["_id", "timestamp"])
+    query = Status.get_motor_collection().find(query_filters, projection).sort(KEYSET_SORT)
+    if not cursor:
+        query = query.skip(offset)
+    documents = await query.limit(limit + 1).to_list(length=limit + 1)
 
-    statuses = await query.sort(-Status.timestamp).skip(offset).limit(limit).to_list()
+    headers = {}
+    if len(documents) > limit:
+        documents = documents[:limit]
+        headers["X-Next-Cursor"] = encode_cursor(documents[-1]["timestamp"], documents[-1]["_id"])
     
-    return [
-        StatusResponse(
-            id=str(status.id),
-            service_id=status.service_id,
-            status=status.status,
-            latency_ms=status.latency_ms,
-            response_code=status.response_code,
-            error_message=status.error_message,
-            timestamp=status.timestamp.isoformat()
-        )
-        for status in statuses
-    ]
+    return json_response(
+        [document_to_response(document, keys) for document in documents],
+        headers=headers
+    )
 
-@router.get("/latest", response_model=List[StatusResponse])
-async def get_latest_status():
+@router.get("/export")
+async def export_status_logs(
+    export_format: Literal['ndjson', 'csv'] = Query(default='ndjson', alias="format", description="Output format"),
+    gzip: bool = Query(default=False, description="Compress the export with gzip"),
+    service_id: str | None = Query(default=None, description="Filter by service ID"),
+    start: datetime | None = Query(default=None, description="Only records at or after this time"),
+    end: datetime | None = Query(default=None, description="Only records before this time"),
+    fields: str | None = Query(default=None, description="Comma-separated response keys to export, or 'summary'")
+):
     """
-    Get the latest status for each service
+    Stream every matching status record, newest first, as NDJSON or CSV
     """
-    services = await Service.find_all().to_list()
-    results = []
-    
-    for service in services:
-        latest_status = await Status.find(
-            Status.service_id == str(service.id)
-        ).sort(-Status.timestamp).limit(1).first_or_none()
-        
-        if latest_status:
-            results.append(StatusResponse(
-                id=str(latest_status.id),
+    try:
+        keys = parse_fields(fields, STATUS_RESPONSE_KEYS, STATUS_FIELD_PRESETS)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    query_filters = {"service_id": service_id} if service_id else {}
+    if start or end:
+        query_filters["timestamp"] = {}
+        if start:
+            query_filters["timestamp"]["$gte"] = start
+        if end:
+            query_filters["timestamp"]["$lt"] = end
+
+    cursor = Status.get_motor_collection().find(query_filters, mongo_projection(keys)).sort(KEYSET_SORT)
+    return export_response(cursor, keys, export_format, gzip, "status")
+
+@router.get("/latest", response_model=List[LatestStatusResponse])
+async def get_latest_status(request: Request):
+    """
+    Get the latest status for each service; services that have never been
+    checked are reported with status "unknown". Served from the latest-status
+    projection alone, which holds a row per service. Supports If-None-Match
+    revalidation.
+    """
+    async def build_latest():
+        latest_statuses = await LatestStatus.find_all().sort(+LatestStatus.service_id).to_list()
+        return [
+            LatestStatusResponse(
+                id=latest_status.status_id,
                 service_id=latest_status.service_id,
+                service_name=latest_status.service_name or "",
                 status=latest_status.status,
                 latency_ms=latest_status.latency_ms,
+                connect_ms=latest_status.connect_ms,
+                ttfb_ms=latest_status.ttfb_ms,
                 response_code=latest_status.response_code,
                 error_message=latest_status.error_message,
-                timestamp=latest_status.timestamp.isoformat()
-            ))
-    
-    return results
+                timestamp=latest_status.timestamp.isoformat() if latest_status.timestamp else None
+            ).model_dump()
+            for latest_status in latest_statuses
+        ]
+
+    return await conditional_json(request, await get_version(LATEST_STATUSES_COLLECTION), build_latest)
 
 @router.get("/count")
 async def get_status_count(service_id: str | None = Query(default=None)):
@@ -131,3 +249,59 @@ async def get_status_count(service_id: str | None = Query(default=None)):
         count = await Status.find_all().count()
     
     return {"count": count}
+
+@router.get("/rollups", response_model=RollupListResponse)
+async def get_status_rollups(
+    service_id: str = Query(..., description="Service ID"),
+    start: datetime = Query(..., description="Range start"),
+    end: datetime | None = Query(default=None, description="Range end, defaults to now"),
+    granularity: Literal['minute', 'hour', 'day'] | None = Query(default=None, description="Bucket size, chosen from the range when omitted")
+):
+    """
+    Get downsampled uptime and latency buckets for a service over a time range
+    """
+    end = end or datetime.now()
+    if end <= start:
+        raise HTTPException(status_code=400, detail="end must be after start")
+
+    granularity = granularity or choose_granularity(start, end)
+    rollups = await find_rollups(service_id, granularity, start, end)
+
+    return RollupListResponse(
+        service_id=service_id,
+        granularity=granularity,
+        start=start.isoformat(),
+        end=end.isoformat(),
+        buckets=[RollupBucketResponse(**summarize_rollup(rollup)) for rollup in rollups]
+    )
+
+@router.get("/analytics", response_model=AnalyticsResponse)
+async def get_status_analytics(
+    service_id: str | None = Query(default=None, description="Limit to one service"),
+    start: datetime | None = Query(default=None, description="Range start, defaults to end minus window_hours"),
+    end: datetime | None = Query(default=None, description="Range end, defaults to the current minute"),
+    window_hours: float = Query(default=24, gt=0, le=24 * 366, description="Range length when start is omitted")
+):
+    """
+    Get uptime %, latency percentiles, incident count and MTTR per service over a time range
+    """
+    # Rounding the default end keeps repeated dashboard queries on the same cache key
+    end = end or datetime.now().replace(second=0, microsecond=0)
+    start = start or end - timedelta(hours=window_hours)
+    if end <= start:
+        raise HTTPException(status_code=400, detail="end must be after start")
+
+    return await compute_analytics(service_id, start, end)
+
+@router.get("/scheduler")
+async def get_scheduler_stats():
+    """
+    Get queue depth, lag and counters of the background health check scheduler,
+    the status write buffer, the probe policy (open circuits) and this worker's shards
+    """
+    return {
+        **scheduler.stats(),
+        "write_buffer": status_buffer.stats(),
+        "probe_policy": probe_policy.stats(),
+        "sharding": shard_manager.stats()
+    }
@@ -0,0 +1,172 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from src.models.status import Status
+from src.models.status_rollup import StatusRollup
+from src.utils.cache import TTLCache
+from src.utils.latency_histogram import histogram_percentile
+from src.utils.rollups import bucket_start, choose_granularity
+from src.config import settings
+
+analytics_cache = TTLCache(maxsize=256, ttl=settings.ANALYTICS_CACHE_TTL)
+
+async def _rollup_totals(service_id: Optional[str], granularity: str, start: datetime, end: datetime) -> Dict[str, Dict[str, Any]]:
+    """Sum counts and merge latency histograms per service inside MongoDB"""
+    match: Dict[str, Any] = {
+        "granularity": granularity,
+        "bucket_start": {"$gte": bucket_start(start, granularity), "$lt": end}
+    }
+    if service_id:
+        match["service_id"] = service_id
+
+    pipeline = [
+        {"$match": match},
+        {"$facet": {
+            "totals": [
+                {"$group": {
+                    "_id": "$service_id",
+                    "count": {"$sum": "$count"},
+                    "up": {"$sum": "$up"},
+                    "down": {"$sum": "$down"},
+                    "latency_sum": {"$sum": "$latency_sum"},
+                    "latency_min": {"$min": "$latency_min"},
+                    "latency_max": {"$max": "$latency_max"}
+                }}
+            ],
+            "histograms": [
+                {"$project": {"service_id": 1, "buckets": {"$objectToArray": "$latency_histogram"}}},
+                {"$unwind": "$buckets"},
+                {"$group": {
+                    "_id": {"service_id": "$service_id", "bucket": "$buckets.k"},
+                    "count": {"$sum": "$buckets.v"}
+                }}
+            ]
+        }}
+    ]
+    facets = await StatusRollup.get_motor_collection().aggregate(pipeline).to_list(length=None)
+    facets = facets[0] if facets else {"totals": [], "histograms": []}
+
+    totals = {row.pop("_id"): {**row, "histogram": {}} for row in facets["totals"]}
+    for row in facets["histograms"]:
+        service_totals = totals.get(row["_id"]["service_id"])
+        if service_totals is not None:
+            service_totals["histogram"][row["_id"]["bucket"]] = row["count"]
+    return totals
+
+async def _status_transitions(service_id: Optional[str], start: datetime, end: datetime) -> Dict[str, List[Dict[str, Any]]]:
+    """Return only the rows where a service's status changed, computed with $setWindowFields"""
+    match: Dict[str, Any] = {"timestamp": {"$gte": start, "$lt": end}}
+    if service_id:
+        match["service_id"] = service_id
+
+    pipeline = [
+        {"$match": match},
+        {"$project": {"service_id": 1, "status": 1, "timestamp": 1}},
+        {"$setWindowFields": {
+            "partitionBy": "$service_id",
+            "sortBy": {"timestamp": 1},
+            "output": {"previous": {"$shift": {"output": "$status", "by": -1, "default": None}}}
+        }},
+        {"$match": {"$expr": {"$ne": ["$status", "$previous"]}}},
+        {"$sort": {"service_id": 1, "timestamp": 1}}
+    ]
+
+    transitions: Dict[str, List[Dict[str, Any]]] = {}
+    async for row in Status.get_motor_collection().aggregate(pipeline):
+        transitions.setdefault(row["service_id"], []).append(row)
+    return transitions
+
+async def _statuses_before(service_ids: List[str], start: datetime) -> Dict[str, str]:
+    """The last status of each service before the range, to know whether it started down"""
+    if not service_ids:
+        return {}
+
+    pipeline = [
+        {"$match": {"service_id": {"$in": service_ids}, "timestamp": {"$lt": start}}},
+        {"$sort": {"service_id": 1, "timestamp": -1}},
+        {"$group": {"_id": "$service_id", "status": {"$first": "$status"}}}
+    ]
+    return {
+        row["_id"]: row["status"]
+        async for row in Status.get_motor_collection().aggregate(pipeline)
+    }
+
+def _incidents(transitions: List[Dict[str, Any]], status_before: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Count down periods that began in the range and the mean time to recover
+    from them. A service already down when the range starts is reported as
+    ongoing_at_start; that outage is not counted as an incident here and its
+    truncated duration stays out of the MTTR.
+    """
+    incident_count = 0
+    recovery_seconds = []
+    down_since = None
+    current = status_before
+    ongoing_at_start = status_before == "down"
+
+    for row in transitions:
+        if row["status"] == current:
+            continue
+        current = row["status"]
+        if current == "down":
+            incident_count += 1
+            down_since = row["timestamp"]
+        elif down_since is not None:
+            recovery_seconds.append((row["timestamp"] - down_since).total_seconds())
+            down_since = None
+
+    return {
+        "incident_count": incident_count,
+        "ongoing_incident": current == "down",
+        "ongoing_at_start": ongoing_at_start,
+        "mttr_seconds": round(sum(recovery_seconds) / len(recovery_seconds), 2) if recovery_seconds else None
+    }
+
+async def compute_analytics(service_id: Optional[str], start: datetime, end: datetime) -> Dict[str, Any]:
+    """
+    Uptime, latency percentiles, incident count and MTTR per service.
+
+    Uptime and latency come from the rollups; incidents come from raw status
+    transitions, seeded with each service's last status before the range, so
+    they only cover the part of the range still retained.
+    Results are cached by (service_id, start, end).
+    """
+    cache_key = (service_id, start, end)
+    cached = analytics_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    granularity = choose_granularity(start, end)
+    totals = await _rollup_totals(service_id, granularity, start, end)
+    transitions = await _status_transitions(service_id, start, end)
+    statuses_before = await _statuses_before(sorted(transitions), start)
+
+    services = []
+    for current_service_id in sorted(set(totals) | set(transitions)):
+        service_totals = totals.get(current_service_id, {})
+        count = service_totals.get("count", 0)
+        up = service_totals.get("up", 0)
+        histogram = service_totals.get("histogram", {})
+
+        services.append({
+            "service_id": current_service_id,
+            "checks": count,
+            "up": up,
+            "down": service_totals.get("down", 0),
+            "uptime_pct": round(up / count * 100, 3) if count else None,
+            "latency_min": service_totals.get("latency_min"),
+            "latency_avg": round(service_totals["latency_sum"] / up, 2) if up else None,
+            "latency_max": service_totals.get("latency_max"),
+            "latency_p50": histogram_percentile(histogram, 0.50),
+            "latency_p95": histogram_percentile(histogram, 0.95),
+            "latency_p99": histogram_percentile(histogram, 0.99),
+            **_incidents(transitions.get(current_service_id, []), statuses_before.get(current_service_id))
+        })
+
+    result = {
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "granularity": granularity,
+        "services": services
+    }
+    analytics_cache.set(cache_key, result)
+    return result
@@ -0,0 +1,75 @@
+import asyncio
+import itertools
+from typing import Any, Dict, List, Optional, Set, Tuple
+from src.config import settings
+
+class Subscription:
+    """One consumer's bounded buffer; the oldest events are dropped when it falls behind"""
+
+    def __init__(self, topics: Set[str], buffer_size: int):
+        self.topics = topics
+        self.dropped = 0
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=buffer_size)
+
+    def push(self, event: Tuple[int, str, Dict[str, Any]]):
+        if self._queue.full():
+            self._queue.get_nowait()
+            self.dropped += 1
+        self._queue.put_nowait(event)
+
+    async def next(self, timeout: float) -> Optional[Tuple[int, str, Dict[str, Any]]]:
+        """Wait for the next event; None if nothing arrived within timeout"""
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def take_dropped(self) -> int:
+        dropped, self.dropped = self.dropped, 0
+        return dropped
+
+class Broadcaster:
+    """
+    In-process fan-out of change events to connected clients.
+
+    Producers call ``publish`` once per change regardless of how many
+    clients listen; each subscriber gets its own bounded buffer so a slow
+    consumer only loses its own oldest events.
+    """
+
+    def __init__(self, buffer_size: Optional[int] = None, max_subscribers: Optional[int] = None):
+        self.buffer_size = buffer_size or settings.EVENTS_BUFFER_SIZE
+        self.max_subscribers = max_subscribers or settings.EVENTS_MAX_SUBSCRIBERS
+        self._subscriptions: List[Subscription] = []
+        self._sequence = itertools.count(1)
+        self._published = 0
+
+    def subscribe(self, topics: Set[str]) -> Optional[Subscription]:
+        """Register a consumer; None when the subscriber limit is reached"""
+        if len(self._subscriptions) >= self.max_subscribers:
+            return None
+        subscription = Subscription(topics, self.buffer_size)
+        self._subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        if subscription in self._subscriptions:
+            self._subscriptions.remove(subscription)
+
+    def publish(self, topic: str, data: Dict[str, Any]):
+        if not self._subscriptions:
+            return
+        event = (next(self._sequence), topic, data)
+        self._published += 1
+        for subscription in self._subscriptions:
+            if topic in subscription.topics:
+                subscription.push(event)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "subscribers": len(self._subscriptions),
+            "published": self._published,
+            "lagging": sum(1 for subscription in self._subscriptions if subscription.dropped)
+        }
+
+broadcaster = Broadcaster()
@@ -1,52 +1,119 @@
 import httpx
 import time
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+from src.config import settings
 
-async def check_service_status(url: str, timeout: int = 10) -> Dict[str, Any]:
+_client: Optional[httpx.AsyncClient] = None
+
+def _build_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        http2=settings.HTTP2_ENABLED,
+        timeout=settings.REQUEST_TIMEOUT,
+        limits=httpx.Limits(
+            max_connections=settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY
+        )
+    )
+
+async def init_http_client() -> httpx.AsyncClient:
+    """Create the shared HTTP client used for service checks"""
+    global _client
+    if _client is None:
+        _client = _build_client()
+    return _client
+
+async def close_http_client():
+    """Close the shared HTTP client and its connection pool"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared HTTP client, creating it if the app lifespan has not"""
+    global _client
+    if _client is None:
+        _client = _build_client()
+    return _client
+
+class _RequestTimings:
+    """Collects connection and response timestamps from httpcore trace events"""
+
+    def __init__(self):
+        self.events: Dict[str, float] = {}
+
+    async def __call__(self, event_name: str, info: Dict[str, Any]):
+        self.events[event_name] = time.perf_counter()
+
+    def _find(self, suffix: str) -> Optional[float]:
+        for event_name, timestamp in self.events.items():
+            if event_name.endswith(suffix):
+                return timestamp
+        return None
+
+    def connect_ms(self) -> float:
+        # No connect events means an idle keep-alive connection was reused
+        started = self.events.get("connection.connect_tcp.started")
+        if started is None:
+            return 0.0
+        finished = (
+            self.events.get("connection.start_tls.complete")
+            or self.events.get("connection.connect_tcp.complete")
+        )
+        if finished is None:
+            return 0.0
+        return round((finished - started) * 1000, 2)
+
+    def ttfb_ms(self) -> Optional[float]:
+        sent = self._find(".send_request_body.complete") or self._find(".send_request_headers.complete")
+        received = self._find(".receive_response_headers.complete")
+        if sent is None or received is None:
+            return None
+        return round((received - sent) * 1000, 2)
+
+def _down_result(start_time: float, timings: _RequestTimings, error_message: str) -> Dict[str, Any]:
+    latency_ms = (time.perf_counter() - start_time) * 1000
+    return {
+        "status": "down",
+        "latency_ms": round(latency_ms, 2),
+        "connect_ms": timings.connect_ms(),
+        "ttfb_ms": None,
+        "response_code": None,
+        "error_message": error_message
+    }
+
+async def check_service_status(url: str, timeout: float = 10) -> Dict[str, Any]:
     """
     Check the status of a service by making an HTTP request.
-    
+
     Args:
         url: The URL to check
         timeout: Request timeout in seconds
-        
+
     Returns:
-        Dictionary containing status, latency, response_code, and error_message
+        Dictionary containing status, latency (total, connect and
+        time-to-first-byte), response_code, and error_message
     """
-    start_time = time.time()
-    
+    client = get_http_client()
+    timings = _RequestTimings()
+    start_time = time.perf_counter()
+
     try:
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            response = await client.get(url)
-            latency_ms = (time.time() - start_time) * 1000
-            
-            return {
-                "status": "up" if response.status_code < 500 else "down",
-                "latency_ms": round(latency_ms, 2),
-                "response_code": response.status_code,
-                "error_message": None
-            }
-    except httpx.TimeoutException:
-        latency_ms = (time.time() - start_time) * 1000
+        response = await client.get(url, timeout=timeout, extensions={"trace": timings})
+        latency_ms = (time.perf_counter() - start_time) * 1000
+
         return {
-            "status": "down",
+            "status": "up" if response.status_code < 500 else "down",
             "latency_ms": round(latency_ms, 2),
-            "response_code": None,
-            "error_message": "Request timeout"
+            "connect_ms": timings.connect_ms(),
+            "ttfb_ms": timings.ttfb_ms(),
+            "response_code": response.status_code,
+            "error_message": None
         }
+    except httpx.TimeoutException:
+        return _down_result(start_time, timings, "Request timeout")
     except httpx.ConnectError as e:
-        latency_ms = (time.time() - start_time) * 1000
-        return {
-            "status": "down",
-            "latency_ms": round(latency_ms, 2),
-            "response_code": None,
-            "error_message": f"Connection error: {str(e)}"
-        }
+        return _down_result(start_time, timings, f"Connection error: {str(e)}")
     except Exception as e:
-        latency_ms = (time.time() - start_time) * 1000
-        return {
-            "status": "down",
-            "latency_ms": round(latency_ms, 2),
-            "response_code": None,
-            "error_message": f"Error: {str(e)}"
-        }
+        return _down_result(start_time, timings, f"Error: {str(e)}")
@@ -0,0 +1,47 @@
+import hashlib
+from typing import Any, Awaitable, Callable, Hashable, Optional, Tuple
+from fastapi import Request, Response
+from src.utils.cache import TTLCache
+from src.utils.serialization import dumps
+from src.config import settings
+
+response_cache = TTLCache(maxsize=settings.RESPONSE_CACHE_MAX_ENTRIES, ttl=settings.RESPONSE_CACHE_TTL)
+
+def request_cache_key(request: Request) -> Tuple[str, Tuple[Tuple[str, str], ...]]:
+    """The path plus sorted query parameters, so reordered parameters share an entry"""
+    return request.url.path, tuple(sorted(request.query_params.multi_items()))
+
+def make_etag(key: Hashable, version: Any) -> str:
+    digest = hashlib.blake2b(repr((key, version)).encode(), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag.removeprefix("W/") in tags
+
+async def conditional_json(request: Request, version: Any, build: Callable[[], Awaitable[Any]]) -> Response:
+    """
+    Serve a JSON read whose content only changes when ``version`` does.
+
+    The ETag is derived from the normalized request and the version, so a
+    matching If-None-Match gets a 304 before any query runs. Otherwise the
+    encoded body is served from the response cache or built and cached.
+    Writes invalidate by bumping the version, which also changes the key.
+    """
+    key = request_cache_key(request)
+    etag = make_etag(key, version)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    body = response_cache.get(etag) if settings.RESPONSE_CACHE_TTL > 0 else None
+    if body is None:
+        body = dumps(await build())
+        if settings.RESPONSE_CACHE_TTL > 0:
+            response_cache.set(etag, body)
+    return Response(content=body, headers=headers, media_type="application/json")
@@ -0,0 +1,190 @@
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from src.models.error_log import ErrorLog
+from src.models.error_group import ErrorGroup, ErrorGroupMember
+from src.utils.fingerprint import compute_fingerprint
+from src.utils.sampling import error_sampler
+from src.config import settings
+
+DUPLICATE_KEY_ERROR = 11000
+
+def error_log_fingerprint(error_log: ErrorLog) -> str:
+    """The client-supplied fingerprint, or one computed from the error's content"""
+    if error_log.fingerprint:
+        return error_log.fingerprint
+    return compute_fingerprint(
+        error_log.message,
+        error_log.error_code,
+        error_log.navigation_context.current_screen if error_log.navigation_context else None,
+        error_log.app_info.app_version
+    )
+
+def counts_towards_raw_limit(severity: str) -> bool:
+    """Severities the storm sampler always keeps are exempt from ERROR_GROUP_RAW_LIMIT"""
+    return not error_sampler.always_keeps(severity)
+
+async def raw_storage_allowance(fingerprints: Iterable[str]) -> Optional[Dict[str, int]]:
+    """
+    How many more raw occurrences each group may store in its current
+    ERROR_GROUP_RAW_WINDOW, or None when ERROR_GROUP_RAW_LIMIT is 0 (no cap).
+
+    A group whose window has ended starts a new one with the full allowance,
+    so a group that has been quiet stores fresh occurrences again. Concurrent
+    batches can overshoot the limit by at most their own size.
+    """
+    limit = settings.ERROR_GROUP_RAW_LIMIT
+    if limit <= 0:
+        return None
+
+    fingerprints = set(fingerprints)
+    if not fingerprints:
+        return {}
+
+    now = datetime.now(timezone.utc)
+    window_cutoff = now - timedelta(seconds=settings.ERROR_GROUP_RAW_WINDOW)
+    allowance = {fingerprint: limit for fingerprint in fingerprints}
+    expired: List[str] = []
+
+    collection = ErrorGroup.get_motor_collection()
+    cursor = collection.find(
+        {"fingerprint": {"$in": list(fingerprints)}},
+        {"fingerprint": 1, "rawStored": 1, "rawWindowStart": 1}
+    )
+    async for document in cursor:
+        window_start = document.get("rawWindowStart")
+        if window_start is not None and window_start.tzinfo is None:
+            window_start = window_start.replace(tzinfo=timezone.utc)
+        if window_start is None or window_start <= window_cutoff:
+            expired.append(document["fingerprint"])
+        else:
+            allowance[document["fingerprint"]] = max(0, limit - document.get("rawStored", 0))
+
+    if expired:
+        # The window filter keeps a concurrent batch from resetting a window twice
+        await collection.update_many(
+            {
+                "fingerprint": {"$in": expired},
+                "$or": [{"rawWindowStart": None}, {"rawWindowStart": {"$lte": window_cutoff}}]
+            },
+            {"$set": {"rawStored": 0, "rawWindowStart": now}}
+        )
+    return allowance
+
+async def _count_new_members(members: Set[Tuple[str, str, str]], first_seen: Dict[str, Any]) -> Dict[Tuple[str, str], int]:
+    """Upsert (fingerprint, kind, member) rows and count the ones seen for the first time"""
+    if not members:
+        return {}
+
+    members = sorted(members)
+    operations = [
+        UpdateOne(
+            {"fingerprint": fingerprint, "kind": kind, "member_id": member_id},
+            {"$setOnInsert": {"first_seen": first_seen[fingerprint]}},
+            upsert=True
+        )
+        for fingerprint, kind, member_id in members
+    ]
+
+    try:
+        result = await ErrorGroupMember.get_motor_collection().bulk_write(operations, ordered=False)
+        upserted = result.upserted_ids
+    except BulkWriteError as e:
+        # A concurrent upsert of the same member loses the race on the unique
+        # index; the other writer counts it
+        if any(error.get("code") != DUPLICATE_KEY_ERROR for error in e.details.get("writeErrors", [])):
+            raise
+        upserted = {item["index"]: item["_id"] for item in e.details.get("upserted", [])}
+
+    new_members: Dict[Tuple[str, str], int] = defaultdict(int)
+    for index in upserted:
+        fingerprint, kind, _ = members[index]
+        new_members[(fingerprint, kind)] += 1
+    return new_members
+
+async def record_error_occurrences(error_logs: List[ErrorLog], sampled_out: Iterable[ErrorLog] = ()):
+    """
+    Fold occurrences into their issue groups: bump the counter, first/last
+    seen and affected device/user counts, and keep the most recent
+    ERROR_GROUP_SAMPLE_SIZE stored occurrences as samples. Sampled-out
+    occurrences were not stored and only count towards the totals.
+    """
+    occurrences: Dict[str, List[ErrorLog]] = defaultdict(list)
+    stored: Set[int] = set()
+    for error_log in error_logs:
+        error_log.fingerprint = error_log_fingerprint(error_log)
+        occurrences[error_log.fingerprint].append(error_log)
+        stored.add(id(error_log))
+    for error_log in sampled_out:
+        error_log.fingerprint = error_log_fingerprint(error_log)
+        occurrences[error_log.fingerprint].append(error_log)
+
+    if not occurrences:
+        return
+
+    members: Set[Tuple[str, str, str]] = set()
+    first_seen: Dict[str, Any] = {}
+    for fingerprint, group_logs in occurrences.items():
+        first_seen[fingerprint] = min(error_log.timestamp for error_log in group_logs)
+        for error_log in group_logs:
+            if error_log.device_info.device_id:
+                members.add((fingerprint, "device", error_log.device_info.device_id))
+            if error_log.user_context and error_log.user_context.user_id:
+                members.add((fingerprint, "user", error_log.user_context.user_id))
+
+    new_members = await _count_new_members(members, first_seen)
+
+    operations = []
+    for fingerprint, group_logs in occurrences.items():
+        latest = max(group_logs, key=lambda error_log: error_log.timestamp)
+        samples = [
+            {
+                "errorLogId": str(error_log.id),
+                "timestamp": error_log.timestamp,
+                "deviceId": error_log.device_info.device_id,
+                "userId": error_log.user_context.user_id if error_log.user_context else None
+            }
+            for error_log in sorted(group_logs, key=lambda error_log: error_log.timestamp)
+            if id(error_log) in stored
+        ]
+        raw_stored = sum(
+            1 for error_log in group_logs
+            if id(error_log) in stored and counts_towards_raw_limit(error_log.severity)
+        )
+
+        update: Dict[str, Any] = {
+            "$inc": {
+                "count": len(group_logs),
+                "affectedDevices": new_members.get((fingerprint, "device"), 0),
+                "affectedUsers": new_members.get((fingerprint, "user"), 0),
+                "rawStored": raw_stored
+            },
+            "$min": {"firstSeen": first_seen[fingerprint]},
+            "$setOnInsert": {"rawWindowStart": datetime.now(timezone.utc)},
+            "$max": {"lastSeen": latest.timestamp},
+            "$set": {
+                "message": latest.message,
+                "severity": latest.severity,
+                "errorCode": latest.error_code,
+                "currentScreen": latest.navigation_context.current_screen if latest.navigation_context else None,
+                "appVersion": latest.app_info.app_version,
+                "environment": latest.app_info.environment
+            }
+        }
+        if samples:
+            update["$push"] = {"samples": {"$each": samples, "$slice": -settings.ERROR_GROUP_SAMPLE_SIZE}}
+
+        operations.append(UpdateOne({"fingerprint": fingerprint}, update, upsert=True))
+
+    collection = ErrorGroup.get_motor_collection()
+    try:
+        await collection.bulk_write(operations, ordered=False)
+    except BulkWriteError as e:
+        write_errors = e.details.get("writeErrors", [])
+        if any(error.get("code") != DUPLICATE_KEY_ERROR for error in write_errors):
+            raise
+        # Two writers created the same group at once; the group exists now,
+        # so the retried updates match it instead of upserting
+        await collection.bulk_write([operations[error["index"]] for error in write_errors], ordered=False)
@@ -0,0 +1,107 @@
+from typing import Dict, List, Set, Tuple
+from beanie import PydanticObjectId
+from pymongo.errors import BulkWriteError
+from src.models.error_log import ErrorLog
+from src.utils.error_groups import (
+    counts_towards_raw_limit,
+    error_log_fingerprint,
+    raw_storage_allowance,
+    record_error_occurrences
+)
+from src.utils.sampling import error_sampler
+from src.utils.events import record_error_logs
+from src.utils.versions import version_bumper
+from src.utils.metrics import error_logs_ingested
+from src.config import settings
+
+ERROR_LOGS_COLLECTION = "error_logs"
+
+async def insert_error_logs(error_logs: List[ErrorLog]) -> Dict[int, str]:
+    """
+    Insert error logs with one unordered insert_many.
+
+    Returns a mapping of list index to error message for the documents that
+    were not written; every other document was inserted and has its id set.
+    """
+    if not error_logs:
+        return {}
+
+    for error_log in error_logs:
+        if error_log.id is None:
+            error_log.id = PydanticObjectId()
+
+    try:
+        await ErrorLog.insert_many(error_logs, ordered=False)
+    except BulkWriteError as e:
+        return {
+            error["index"]: error.get("errmsg", "Write error")
+            for error in e.details.get("writeErrors", [])
+        }
+    except Exception as e:
+        return {index: f"Error: {str(e)}" for index in range(len(error_logs))}
+    return {}
+
+async def ingest_error_logs(error_logs: List[ErrorLog]) -> Tuple[Dict[int, str], Set[int]]:
+    """
+    Fingerprint, sample, insert and group error logs.
+
+    Each group stores at most ERROR_GROUP_RAW_LIMIT raw occurrences per
+    ERROR_GROUP_RAW_WINDOW; later ones, like those dropped by storm sampling,
+    only count on the group, so raw storage grows with distinct problems
+    rather than event volume. This cap also applies to occurrences the storm
+    sampler kept, except for severities it always keeps (critical by
+    default), which are always stored.
+
+    Returns the write errors (as from insert_error_logs, keyed by index into
+    ``error_logs``) and the indexes of the logs that were sampled out or over
+    the raw limit. Grouping failures are logged and do not fail the stored
+    documents.
+    """
+    kept: List[int] = []
+    sampled_out: Set[int] = set()
+
+    for index, error_log in enumerate(error_logs):
+        error_log.fingerprint = error_log_fingerprint(error_log)
+        if settings.ERROR_SAMPLING_ENABLED:
+            sample_rate = error_sampler.decide(error_log.fingerprint, error_log.severity)
+            if sample_rate is None:
+                sampled_out.add(index)
+                continue
+            error_log.sample_rate = sample_rate
+        kept.append(index)
+
+    allowance = await raw_storage_allowance(error_logs[index].fingerprint for index in kept)
+    if allowance is not None:
+        within_limit = []
+        for index in kept:
+            error_log = error_logs[index]
+            if not counts_towards_raw_limit(error_log.severity):
+                within_limit.append(index)
+                continue
+            fingerprint = error_log.fingerprint
+            if allowance[fingerprint] > 0:
+                allowance[fingerprint] -= 1
+                within_limit.append(index)
+            else:
+                sampled_out.add(index)
+        kept = within_limit
+
+    kept_errors = await insert_error_logs([error_logs[index] for index in kept])
+    write_errors = {kept[position]: error for position, error in kept_errors.items()}
+    inserted = [error_logs[index] for position, index in enumerate(kept) if position not in kept_errors]
+
+    for error_log in inserted:
+        error_logs_ingested.inc(error_log.severity, "stored")
+    for index in sampled_out:
+        error_logs_ingested.inc(error_logs[index].severity, "sampled_out")
+    for index in write_errors:
+        error_logs_ingested.inc(error_logs[index].severity, "failed")
+
+    if inserted:
+        version_bumper.touch(ERROR_LOGS_COLLECTION)
+    record_error_logs(inserted)
+    try:
+        await record_error_occurrences(inserted, [error_logs[index] for index in sorted(sampled_out)])
+    except Exception as e:
+        print(f"Failed to update error groups: {str(e)}")
+    return write_errors, sampled_out
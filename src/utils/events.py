@@ -0,0 +1,186 @@
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, Optional
+from bson import ObjectId
+from src.models.status import Status
+from src.models.error_log import ErrorLog
+from src.models.latest_status import LatestStatus
+from src.utils.broadcaster import broadcaster
+from src.utils.latest_status import LATEST_STATUSES_COLLECTION
+from src.utils.versions import get_version
+from src.config import settings
+
+STATUS_TOPIC = "status"
+ERROR_LOG_TOPIC = "error_log"
+PUSHED_SEVERITIES = ("high", "critical")
+
+_last_status: Dict[str, str] = {}
+
+def events_polled() -> bool:
+    """
+    Whether events are read back from MongoDB instead of published by the
+    worker that wrote them.
+
+    Local publishing only sees this process's writes, so it suits a single
+    worker (or clients pinned to the worker that probes their services).
+    EVENTS_SOURCE "auto" polls whenever sharding spreads probes over workers.
+    """
+    if settings.EVENTS_SOURCE == "auto":
+        return settings.SHARDING_ENABLED
+    return settings.EVENTS_SOURCE == "poll"
+
+async def seed_last_statuses():
+    """Start transition tracking from the stored latest status of each service"""
+    cursor = LatestStatus.get_motor_collection().find({"status_id": {"$ne": None}}, {"service_id": 1, "status": 1})
+    async for document in cursor:
+        _last_status.setdefault(document["service_id"], document["status"])
+
+def _publish_transition(service_id: str, status: str, details: Dict[str, Any]):
+    previous = _last_status.get(service_id)
+    _last_status[service_id] = status
+    if previous == status:
+        return
+    broadcaster.publish(STATUS_TOPIC, {
+        "service_id": service_id,
+        "previous_status": previous,
+        "status": status,
+        **details
+    })
+
+def record_status(status: Status):
+    """Publish a status event when a service's status differs from its previous one"""
+    if events_polled():
+        return
+    _publish_transition(status.service_id, status.status, {
+        "latency_ms": status.latency_ms,
+        "response_code": status.response_code,
+        "error_message": status.error_message,
+        "timestamp": status.timestamp.isoformat()
+    })
+
+def forget_service(service_id: str):
+    _last_status.pop(service_id, None)
+
+def record_error_logs(error_logs: Iterable[ErrorLog]):
+    """Publish newly stored high and critical error logs"""
+    if events_polled():
+        return
+    for error_log in error_logs:
+        if error_log.severity not in PUSHED_SEVERITIES:
+            continue
+        broadcaster.publish(ERROR_LOG_TOPIC, {
+            "id": str(error_log.id),
+            "message": error_log.message,
+            "severity": error_log.severity,
+            "errorCode": error_log.error_code,
+            "fingerprint": error_log.fingerprint,
+            "platform": error_log.device_info.platform,
+            "environment": error_log.app_info.environment,
+            "timestamp": error_log.timestamp.isoformat()
+        })
+
+class EventPoller:
+    """
+    Derives events from MongoDB so every worker streams every write.
+
+    Status transitions come from the latest-status projection, re-read only
+    when its collection version changes. Error logs are read by _id over the
+    last EVENTS_POLL_LOOKBACK seconds, so logs whose ids were assigned before
+    a slow insert are still seen once; ids already published are remembered
+    for that long.
+    """
+
+    def __init__(self, poll_interval: Optional[float] = None, lookback: Optional[float] = None):
+        self.poll_interval = poll_interval or settings.EVENTS_POLL_INTERVAL
+        self.lookback = lookback or settings.EVENTS_POLL_LOOKBACK
+        self._status_version: Optional[int] = None
+        self._status_ids: Dict[str, str] = {}
+        self._published_error_logs: Dict[ObjectId, float] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._poll())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def poll_statuses(self):
+        version = await get_version(LATEST_STATUSES_COLLECTION)
+        if version == self._status_version:
+            return
+        self._status_version = version
+
+        cursor = LatestStatus.get_motor_collection().find(
+            {"status_id": {"$ne": None}},
+            {"_id": 0, "connect_ms": 0, "ttfb_ms": 0, "service_name": 0}
+        )
+        async for document in cursor:
+            service_id = document["service_id"]
+            if self._status_ids.get(service_id) == document["status_id"]:
+                continue
+            self._status_ids[service_id] = document["status_id"]
+            _publish_transition(service_id, document["status"], {
+                "latency_ms": document.get("latency_ms"),
+                "response_code": document.get("response_code"),
+                "error_message": document.get("error_message"),
+                "timestamp": document["timestamp"].isoformat()
+            })
+
+    async def poll_error_logs(self):
+        now = time.monotonic()
+        self._published_error_logs = {
+            error_log_id: seen_at for error_log_id, seen_at in self._published_error_logs.items()
+            if now - seen_at < self.lookback
+        }
+
+        since = ObjectId.from_datetime(datetime.now(timezone.utc) - timedelta(seconds=self.lookback))
+        cursor = ErrorLog.get_motor_collection().find(
+            {"_id": {"$gt": since}, "severity": {"$in": list(PUSHED_SEVERITIES)}},
+            {"message": 1, "severity": 1, "errorCode": 1, "fingerprint": 1,
+             "deviceInfo.platform": 1, "appInfo.environment": 1, "timestamp": 1}
+        ).sort("_id", 1)
+        async for document in cursor:
+            if document["_id"] in self._published_error_logs:
+                continue
+            self._published_error_logs[document["_id"]] = now
+            broadcaster.publish(ERROR_LOG_TOPIC, {
+                "id": str(document["_id"]),
+                "message": document["message"],
+                "severity": document["severity"],
+                "errorCode": document.get("errorCode"),
+                "fingerprint": document.get("fingerprint"),
+                "platform": document["deviceInfo"]["platform"],
+                "environment": document["appInfo"]["environment"],
+                "timestamp": document["timestamp"].isoformat()
+            })
+
+    async def _poll(self):
+        # Logs stored before this worker started are history, not events
+        await self._skip_existing_error_logs()
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                await self.poll_statuses()
+                await self.poll_error_logs()
+            except Exception as e:
+                print(f"Event poll failed: {str(e)}")
+
+    async def _skip_existing_error_logs(self):
+        now = time.monotonic()
+        since = ObjectId.from_datetime(datetime.now(timezone.utc) - timedelta(seconds=self.lookback))
+        cursor = ErrorLog.get_motor_collection().find(
+            {"_id": {"$gt": since}, "severity": {"$in": list(PUSHED_SEVERITIES)}},
+            {"_id": 1}
+        )
+        try:
+            async for document in cursor:
+                self._published_error_logs[document["_id"]] = now
+        except Exception as e:
+            print(f"Event poll failed: {str(e)}")
+
+event_poller = EventPoller()
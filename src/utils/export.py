@@ -0,0 +1,80 @@
+import csv
+import io
+import zlib
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List
+from fastapi.responses import StreamingResponse
+from src.utils.serialization import document_to_response, dumps
+
+CHUNK_SIZE = 64 * 1024
+CURSOR_BATCH_SIZE = 1000
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv"
+}
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        return dumps(value).decode()
+    return value
+
+async def _encode(cursor, keys: List[str], export_format: str) -> AsyncIterator[bytes]:
+    """Encode documents from a Motor cursor, yielding chunks of about CHUNK_SIZE bytes"""
+    buffer = io.StringIO() if export_format == "csv" else None
+    writer = csv.writer(buffer) if buffer is not None else None
+    chunk = bytearray()
+
+    if writer is not None:
+        writer.writerow(keys)
+        chunk += buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+
+    async for document in cursor.batch_size(CURSOR_BATCH_SIZE):
+        item = document_to_response(document, keys)
+        if writer is not None:
+            writer.writerow([_csv_value(item[key]) for key in keys])
+            chunk += buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+        else:
+            chunk += dumps(item)
+            chunk += b"\n"
+
+        if len(chunk) >= CHUNK_SIZE:
+            yield bytes(chunk)
+            chunk.clear()
+
+    if chunk:
+        yield bytes(chunk)
+
+async def _gzip(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    compressor = zlib.compressobj(wbits=31)
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+def export_response(cursor, keys: List[str], export_format: str, compress: bool, filename: str) -> StreamingResponse:
+    """
+    Stream every document of a Motor cursor as NDJSON or CSV, optionally
+    gzip-compressed, without holding more than one chunk in memory.
+    """
+    body = _encode(cursor, keys, export_format)
+    filename = f"{filename}.{export_format}"
+    media_type = MEDIA_TYPES[export_format]
+    headers: Dict[str, str] = {}
+
+    if compress:
+        body = _gzip(body)
+        filename += ".gz"
+        media_type = "application/gzip"
+
+    headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return StreamingResponse(body, media_type=media_type, headers=headers)
@@ -0,0 +1,25 @@
+import hashlib
+import re
+from typing import Optional
+
+_UUID = re.compile(r"\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b", re.IGNORECASE)
+_HEX = re.compile(r"\b(?:0x)?[0-9a-f]{8,}\b", re.IGNORECASE)
+_NUMBER = re.compile(r"\d+(?:\.\d+)?")
+_WHITESPACE = re.compile(r"\s+")
+
+def normalize_message(message: str) -> str:
+    """Strip ids, addresses and numbers so repeats of one error read the same"""
+    message = _UUID.sub("<uuid>", message)
+    message = _HEX.sub("<hex>", message)
+    message = _NUMBER.sub("<n>", message)
+    return _WHITESPACE.sub(" ", message).strip().lower()
+
+def compute_fingerprint(
+    message: str,
+    error_code: Optional[str],
+    screen: Optional[str],
+    app_version: Optional[str]
+) -> str:
+    """Stable fingerprint of an error from its message, code, screen and app version"""
+    parts = [normalize_message(message), error_code or "", screen or "", app_version or ""]
+    return hashlib.sha256("\x1f".join(parts).encode()).hexdigest()[:32]
@@ -0,0 +1,148 @@
+import asyncio
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from beanie import PydanticObjectId
+from src.models.error_log import ErrorLog
+from src.utils.error_ingest import ingest_error_logs
+from src.config import settings
+
+class ErrorLogIngestQueue:
+    """
+    Bounded in-process queue that decouples error-log requests from MongoDB.
+
+    ``submit`` never waits: it either enqueues the log or reports the queue
+    as full so the caller can shed load. Workers drain the queue in batches
+    of up to ``batch_size``, waiting at most ``batch_wait`` seconds to fill
+    a batch once the first item arrives.
+    """
+
+    def __init__(
+        self,
+        maxsize: Optional[int] = None,
+        workers: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        batch_wait: Optional[float] = None
+    ):
+        self.maxsize = maxsize or settings.ERROR_LOG_QUEUE_MAX_SIZE
+        self.workers = workers or settings.ERROR_LOG_QUEUE_WORKERS
+        self.batch_size = batch_size or settings.ERROR_LOG_QUEUE_BATCH_SIZE
+        self.batch_wait = settings.ERROR_LOG_QUEUE_BATCH_WAIT if batch_wait is None else batch_wait
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+
+        self._accepted = 0
+        self._rejected = 0
+        self._stored = 0
+        self._failed = 0
+        self._sampled_out = 0
+        self._latency_count = 0
+        self._latency_sum_ms = 0.0
+        self._latency_max_ms = 0.0
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    def submit(self, error_log: ErrorLog) -> bool:
+        """Enqueue an error log without waiting; returns False when the queue is full"""
+        if self._queue is None:
+            raise RuntimeError("Error log ingest queue is not running")
+        if error_log.id is None:
+            error_log.id = PydanticObjectId()
+        try:
+            self._queue.put_nowait((time.perf_counter(), error_log))
+        except asyncio.QueueFull:
+            self._rejected += 1
+            return False
+        self._accepted += 1
+        return True
+
+    async def start(self):
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.maxsize)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self):
+        """Let the workers drain the queue, then stop them"""
+        if self._queue is not None and self.running:
+            try:
+                await asyncio.wait_for(self._queue.join(), timeout=settings.ERROR_LOG_QUEUE_DRAIN_TIMEOUT)
+            except asyncio.TimeoutError:
+                print(f"Error log queue not drained on shutdown; {self._queue.qsize()} logs left")
+
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "depth": self._queue.qsize() if self._queue is not None else 0,
+            "max_size": self.maxsize,
+            "accepted": self._accepted,
+            "rejected": self._rejected,
+            "stored": self._stored,
+            "failed": self._failed,
+            "sampled_out": self._sampled_out,
+            "avg_latency_ms": round(self._latency_sum_ms / self._latency_count, 2) if self._latency_count else None,
+            "max_latency_ms": round(self._latency_max_ms, 2)
+        }
+
+    def _take_ready(self, batch: List[Tuple[float, ErrorLog]]) -> List[Tuple[float, ErrorLog]]:
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+        return batch
+
+    async def _worker(self):
+        while True:
+            batch = [await self._queue.get()]
+            deadline = time.perf_counter() + self.batch_wait
+            self._take_ready(batch)
+
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+                except asyncio.TimeoutError:
+                    break
+                self._take_ready(batch)
+
+            try:
+                await self._store(batch)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Keep the worker alive; a dead worker would leave the queue filling up
+                self._failed += len(batch)
+                print(f"Failed to store {len(batch)} queued error logs: {str(e)}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _store(self, batch: List[Tuple[float, ErrorLog]]):
+        if not batch:
+            return
+        write_errors, sampled_out = await ingest_error_logs([error_log for _, error_log in batch])
+        self._failed += len(write_errors)
+        self._sampled_out += len(sampled_out)
+        self._stored += len(batch) - len(write_errors) - len(sampled_out)
+
+        now = time.perf_counter()
+        for enqueued_at, _ in batch:
+            latency_ms = (now - enqueued_at) * 1000
+            self._latency_count += 1
+            self._latency_sum_ms += latency_ms
+            self._latency_max_ms = max(self._latency_max_ms, latency_ms)
+
+        for index, error in write_errors.items():
+            print(f"Failed to store queued error log {batch[index][1].id}: {error}")
+
+ingest_queue = ErrorLogIngestQueue()
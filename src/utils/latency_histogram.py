@@ -0,0 +1,45 @@
+import bisect
+import math
+from typing import Dict, Iterable, List, Optional
+
+# Log-spaced bucket upper bounds from 1 ms to ~2 minutes, about 12% apart, so
+# a percentile read from a bucket is off by at most one bucket width
+GROWTH_FACTOR = 1.12
+BUCKET_BOUNDS: List[float] = [
+    round(GROWTH_FACTOR ** exponent, 3)
+    for exponent in range(int(math.log(120000) / math.log(GROWTH_FACTOR)) + 2)
+]
+
+def bucket_index(latency_ms: float) -> int:
+    """Index of the bucket whose upper bound is the first >= latency_ms"""
+    return min(bisect.bisect_left(BUCKET_BOUNDS, latency_ms), len(BUCKET_BOUNDS) - 1)
+
+def merge_histograms(histograms: Iterable[Dict[str, int]]) -> Dict[str, int]:
+    merged: Dict[str, int] = {}
+    for histogram in histograms:
+        for index, count in histogram.items():
+            merged[index] = merged.get(index, 0) + count
+    return merged
+
+def histogram_percentile(histogram: Dict[str, int], quantile: float) -> Optional[float]:
+    """
+    Estimate a percentile from bucket counts keyed by bucket index.
+
+    Interpolates linearly inside the bucket holding the requested rank.
+    """
+    total = sum(histogram.values())
+    if total == 0:
+        return None
+
+    rank = quantile * total
+    seen = 0
+    for index in sorted(histogram, key=int):
+        count = histogram[index]
+        if seen + count >= rank:
+            position = int(index)
+            upper = BUCKET_BOUNDS[position]
+            lower = BUCKET_BOUNDS[position - 1] if position > 0 else 0.0
+            fraction = (rank - seen) / count if count else 1.0
+            return round(lower + (upper - lower) * fraction, 2)
+        seen += count
+    return BUCKET_BOUNDS[int(max(histogram, key=int))]
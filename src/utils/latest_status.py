@@ -0,0 +1,123 @@
+from typing import Dict, Iterable, Tuple
+from pymongo import DeleteMany, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+from src.models.service import Service
+from src.models.status import Status
+from src.models.latest_status import LatestStatus
+from src.utils.versions import bump_version, version_bumper
+
+DUPLICATE_KEY_ERROR = 11000
+LATEST_STATUSES_COLLECTION = "latest_statuses"
+
+def _projection_fields(status: Status) -> dict:
+    return {
+        "status_id": str(status.id),
+        "status": status.status,
+        "latency_ms": status.latency_ms,
+        "connect_ms": status.connect_ms,
+        "ttfb_ms": status.ttfb_ms,
+        "response_code": status.response_code,
+        "error_message": status.error_message,
+        "timestamp": status.timestamp
+    }
+
+async def record_latest_statuses(statuses: Iterable[Status]):
+    """
+    Upsert the latest-status projection from a batch of written Status records.
+
+    The filter only matches an older (or never checked) projection, so a
+    stale record turns into an upsert that collides with the unique
+    service_id index and is ignored.
+    """
+    newest: Dict[str, Status] = {}
+    for status in statuses:
+        current = newest.get(status.service_id)
+        if current is None or status.timestamp >= current.timestamp:
+            newest[status.service_id] = status
+
+    if not newest:
+        return
+
+    operations = [
+        UpdateOne(
+            {"service_id": service_id, "$or": [{"timestamp": {"$lte": status.timestamp}}, {"timestamp": None}]},
+            {"$set": _projection_fields(status)},
+            upsert=True
+        )
+        for service_id, status in newest.items()
+    ]
+
+    try:
+        await LatestStatus.get_motor_collection().bulk_write(operations, ordered=False)
+    except BulkWriteError as e:
+        errors = [
+            error for error in e.details.get("writeErrors", [])
+            if error.get("code") != DUPLICATE_KEY_ERROR
+        ]
+        if errors:
+            raise
+    version_bumper.touch(LATEST_STATUSES_COLLECTION)
+
+def _service_row(service: Service) -> Tuple[dict, dict]:
+    """Filter and upsert update giving a service its row, "unknown" until first checked"""
+    return (
+        {"service_id": str(service.id)},
+        {"$set": {"service_name": service.name}, "$setOnInsert": {"status": "unknown"}}
+    )
+
+async def register_latest_service(service: Service):
+    """Add a new service to the projection, or update its name"""
+    collection = LatestStatus.get_motor_collection()
+    row_filter, update = _service_row(service)
+    try:
+        await collection.update_one(row_filter, update, upsert=True)
+    except DuplicateKeyError:
+        # A first status created the row concurrently; update it instead
+        await collection.update_one(row_filter, update)
+    await bump_version(LATEST_STATUSES_COLLECTION)
+
+async def sync_latest_services(services: Iterable[Service]):
+    """
+    Give every service a projection row carrying its name and drop rows of
+    services that no longer exist, so /status/latest reads nothing else.
+    """
+    services = list(services)
+    operations = [UpdateOne(*_service_row(service), upsert=True) for service in services]
+    operations.append(DeleteMany({"service_id": {"$nin": [str(service.id) for service in services]}}))
+    await LatestStatus.get_motor_collection().bulk_write(operations, ordered=False)
+    await bump_version(LATEST_STATUSES_COLLECTION)
+
+async def delete_latest_status(service_id: str):
+    await LatestStatus.find(LatestStatus.service_id == service_id).delete()
+    await bump_version(LATEST_STATUSES_COLLECTION)
+
+async def rebuild_latest_statuses():
+    """Backfill the projection from the status history if it is empty"""
+    if await LatestStatus.find_all().limit(1).first_or_none():
+        return
+
+    pipeline = [
+        {"$sort": {"service_id": 1, "timestamp": -1}},
+        {"$group": {"_id": "$service_id", "latest": {"$first": "$$ROOT"}}},
+        {"$replaceWith": "$latest"},
+        {"$project": {
+            "_id": 0,
+            "service_id": 1,
+            "status_id": {"$toString": "$_id"},
+            "status": 1,
+            "latency_ms": 1,
+            "connect_ms": 1,
+            "ttfb_ms": 1,
+            "response_code": 1,
+            "error_message": 1,
+            "timestamp": 1
+        }},
+        {"$merge": {
+            "into": LatestStatus.get_motor_collection().name,
+            "on": "service_id",
+            "whenMatched": "keepExisting",
+            "whenNotMatched": "insert"
+        }}
+    ]
+    await Status.get_motor_collection().aggregate(pipeline).to_list(length=None)
+    await bump_version(LATEST_STATUSES_COLLECTION)
@@ -0,0 +1,36 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+from beanie import PydanticObjectId
+from pymongo import DESCENDING
+
+KEYSET_SORT = [("timestamp", DESCENDING), ("_id", DESCENDING)]
+
+def encode_cursor(timestamp: datetime, document_id: Any) -> str:
+    """Encode the sort key of the last item on a page as an opaque cursor"""
+    payload = json.dumps({"t": timestamp.isoformat(), "id": str(document_id)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, PydanticObjectId]:
+    """Decode a cursor produced by encode_cursor; raises ValueError if malformed"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(payload["t"]), PydanticObjectId(payload["id"])
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {str(e)}")
+
+def apply_cursor(filters: Dict[str, Any], cursor: Optional[str]) -> Dict[str, Any]:
+    """Restrict a query to the items after the cursor in (-timestamp, -_id) order"""
+    if not cursor:
+        return filters
+
+    timestamp, document_id = decode_cursor(cursor)
+    after_cursor = {
+        "$or": [
+            {"timestamp": {"$lt": timestamp}},
+            {"timestamp": timestamp, "_id": {"$lt": document_id}}
+        ]
+    }
+    return {"$and": [filters, after_cursor]} if filters else after_cursor
@@ -0,0 +1,196 @@
+import asyncio
+import time
+from typing import Any, Dict, List, Optional, Sequence
+from src.models.service import Service
+from src.models.status import Status
+from src.utils.checker import check_service_status
+from src.utils.metrics import probe_duration
+from src.utils.probe_policy import probe_policy
+from src.config import settings
+
+def _service_setting(service: Service, name: str, default: float) -> float:
+    value = getattr(service, name, None)
+    if value is None and service.metadata:
+        value = service.metadata.get(name)
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return default
+    return value if value > 0 else default
+
+def get_check_interval(service: Service) -> float:
+    """Seconds between scheduled checks, from the service or its metadata"""
+    return _service_setting(service, "check_interval", settings.CHECK_INTERVAL)
+
+def get_check_timeout(service: Service) -> float:
+    """Request timeout in seconds, from the service or its metadata"""
+    return _service_setting(service, "check_timeout", settings.REQUEST_TIMEOUT)
+
+def status_from_result(status_data: Dict[str, Any]) -> Status:
+    """Build a Status record from a probe result carrying its service_id"""
+    return Status(
+        service_id=status_data["service_id"],
+        status=status_data["status"],
+        latency_ms=status_data["latency_ms"],
+        connect_ms=status_data["connect_ms"],
+        ttfb_ms=status_data["ttfb_ms"],
+        response_code=status_data["response_code"],
+        error_message=status_data["error_message"]
+    )
+
+def probe_outcome(status_data: Dict[str, Any]) -> str:
+    """Classify a probe result for metrics: up, http_error, timeout, connect_error or error"""
+    if status_data["status"] == "up":
+        return "up"
+    if status_data["response_code"] is not None:
+        return "http_error"
+    error_message = status_data["error_message"] or ""
+    if error_message == "Request timeout":
+        return "timeout"
+    if error_message.startswith("Connection error"):
+        return "connect_error"
+    return "error"
+
+async def _hedged_check(url: str, timeout: float, hedge_delay: Optional[float]) -> Dict[str, Any]:
+    """Send a second request if the first has not answered after hedge_delay; first "up" wins"""
+    tasks = {asyncio.create_task(check_service_status(url, timeout))}
+    try:
+        if hedge_delay is not None and hedge_delay < timeout:
+            done, _ = await asyncio.wait(tasks, timeout=hedge_delay)
+            if not done:
+                tasks.add(asyncio.create_task(check_service_status(url, timeout - hedge_delay)))
+
+        status_data = None
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                status_data = task.result()
+                if status_data["status"] == "up":
+                    return status_data
+        return status_data
+    finally:
+        for task in tasks:
+            task.cancel()
+
+async def probe_service(
+    service: Service,
+    timeout: Optional[float] = None,
+    deadline_at: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    Check one service under its probe policy and record the outcome.
+
+    The first attempt uses the adaptive timeout (and a hedged second request
+    when enabled); up to PROBE_RETRIES retries of a failed attempt use the
+    full ceiling, so a transient blip or a slowed-down service is not
+    reported as down. An attempt that already timed out at the ceiling is
+    not retried, and retries are cut to what is left before ``deadline_at``
+    (a time.monotonic() value), so retries never make a sweep much longer
+    than a single attempt would. An explicit ``timeout`` replaces the
+    adaptive one.
+    """
+    service_id = str(service.id)
+    ceiling = timeout or get_check_timeout(service)
+    attempt_timeout = timeout or probe_policy.timeout_for(service_id, ceiling)
+
+    status_data = await _hedged_check(service.url, attempt_timeout, probe_policy.hedge_delay(service_id))
+    for _ in range(settings.PROBE_RETRIES):
+        if status_data["status"] == "up":
+            break
+        # The service did not answer within the most it is allowed; asking again costs as much
+        if probe_outcome(status_data) == "timeout" and attempt_timeout >= ceiling:
+            break
+        attempt_timeout = ceiling
+        if deadline_at is not None:
+            attempt_timeout = min(ceiling, deadline_at - time.monotonic() - settings.PROBE_RETRY_DELAY)
+            if attempt_timeout < settings.PROBE_TIMEOUT_FLOOR:
+                break
+        await asyncio.sleep(settings.PROBE_RETRY_DELAY)
+        status_data = await check_service_status(service.url, attempt_timeout)
+
+    probe_policy.record(service_id, status_data)
+    probe_duration.observe(status_data["latency_ms"] / 1000, service_id, probe_outcome(status_data))
+    return status_data
+
+def _deadline_result(latency_ms: float) -> Dict[str, Any]:
+    return {
+        "status": "down",
+        "latency_ms": round(latency_ms, 2),
+        "connect_ms": None,
+        "ttfb_ms": None,
+        "response_code": None,
+        "error_message": "Sweep deadline exceeded"
+    }
+
+async def run_probe_sweep(
+    services: Sequence[Service],
+    concurrency: Optional[int] = None,
+    deadline: Optional[float] = None,
+    timeout: Optional[float] = None,
+    force: bool = False
+) -> Dict[str, Any]:
+    """
+    Probe a set of services concurrently.
+
+    Args:
+        services: Services to probe
+        concurrency: Maximum number of probes in flight at once
+        deadline: Overall sweep deadline in seconds; probes still running
+            when it expires are cancelled and reported as down
+        timeout: Per-request timeout in seconds; defaults to each
+            service's adaptive timeout
+        force: Probe services whose circuit is open as well
+
+    Returns:
+        Dictionary containing the probe results (in the same order as
+        ``services``, each with its ``service_id``), the sweep duration
+        in milliseconds, the number of probes cut off by the deadline and
+        the ids of the services skipped because their circuit is open
+    """
+    concurrency = concurrency or settings.PROBE_CONCURRENCY
+    deadline = deadline if deadline is not None else settings.SWEEP_DEADLINE
+
+    semaphore = asyncio.Semaphore(concurrency)
+    start_time = time.perf_counter()
+    deadline_at = time.monotonic() + deadline if deadline else None
+
+    circuit_open = []
+    if not force:
+        now = time.monotonic()
+        circuit_open = [str(service.id) for service in services if not probe_policy.allow(str(service.id), now)]
+        skipped = set(circuit_open)
+        services = [service for service in services if str(service.id) not in skipped]
+
+    async def probe(service: Service) -> Dict[str, Any]:
+        async with semaphore:
+            return await probe_service(service, timeout, deadline_at)
+
+    tasks = [asyncio.create_task(probe(service)) for service in services]
+    timed_out = 0
+
+    if tasks:
+        done, pending = await asyncio.wait(tasks, timeout=deadline)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        timed_out = len(pending)
+
+    duration_ms = (time.perf_counter() - start_time) * 1000
+    results: List[Dict[str, Any]] = []
+
+    for service, task in zip(services, tasks):
+        if task.cancelled():
+            status_data = _deadline_result(duration_ms)
+            probe_duration.observe(duration_ms / 1000, str(service.id), "deadline_exceeded")
+        else:
+            status_data = task.result()
+        results.append({"service_id": str(service.id), **status_data})
+
+    return {
+        "results": results,
+        "duration_ms": round(duration_ms, 2),
+        "timed_out": timed_out,
+        "circuit_open": circuit_open
+    }
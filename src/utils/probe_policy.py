@@ -0,0 +1,106 @@
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+from src.config import settings
+
+class _Breaker:
+    __slots__ = ("failures", "opened", "open_until")
+
+    def __init__(self):
+        self.failures = 0
+        self.opened = 0
+        self.open_until = 0.0
+
+def _quantile(values, quantile: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(quantile * len(ordered)))]
+
+class ProbePolicy:
+    """
+    Per-service probe state shared by the sweep and the scheduler.
+
+    Recent successful latencies give each service a timeout of its p99 times
+    PROBE_TIMEOUT_MULTIPLIER, never below PROBE_TIMEOUT_FLOOR and never above
+    the service's configured check timeout, which stays the ceiling. A
+    service that just failed gets the full ceiling again, so one that slowed
+    down is not held to a timeout it can no longer meet.
+
+    After CIRCUIT_FAILURE_THRESHOLD consecutive failures the service's
+    circuit opens and it is not probed for CIRCUIT_BASE_BACKOFF seconds,
+    doubling on every further failure up to CIRCUIT_MAX_BACKOFF. The first
+    probe after the backoff decides: success closes the circuit.
+    """
+
+    def __init__(self):
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._breakers: Dict[str, _Breaker] = {}
+
+    def timeout_for(self, service_id: str, ceiling: float) -> float:
+        if not settings.ADAPTIVE_TIMEOUTS_ENABLED or service_id in self._breakers:
+            return ceiling
+        history = self._latencies.get(service_id)
+        if not history or len(history) < settings.PROBE_LATENCY_MIN_SAMPLES:
+            return ceiling
+        adaptive = _quantile(history, 0.99) / 1000 * settings.PROBE_TIMEOUT_MULTIPLIER
+        return min(ceiling, max(settings.PROBE_TIMEOUT_FLOOR, adaptive))
+
+    def hedge_delay(self, service_id: str) -> Optional[float]:
+        """Seconds after which to send a second request, or None to not hedge"""
+        if not settings.PROBE_HEDGE_ENABLED:
+            return None
+        history = self._latencies.get(service_id)
+        if not history or len(history) < settings.PROBE_LATENCY_MIN_SAMPLES:
+            return None
+        return _quantile(history, 0.95) / 1000
+
+    def allow(self, service_id: str, now: Optional[float] = None) -> bool:
+        """Whether the service may be probed now, i.e. its circuit is not open"""
+        return self.retry_at(service_id, now) is None
+
+    def retry_at(self, service_id: str, now: Optional[float] = None) -> Optional[float]:
+        """Monotonic time the open circuit allows the next probe, or None if closed"""
+        breaker = self._breakers.get(service_id)
+        now = time.monotonic() if now is None else now
+        if breaker is None or breaker.open_until <= now:
+            return None
+        return breaker.open_until
+
+    def record(self, service_id: str, status_data: Dict[str, Any], now: Optional[float] = None):
+        if status_data["status"] == "up":
+            history = self._latencies.get(service_id)
+            if history is None:
+                history = self._latencies[service_id] = deque(maxlen=settings.PROBE_LATENCY_HISTORY)
+            history.append(status_data["latency_ms"])
+            self._breakers.pop(service_id, None)
+            return
+
+        breaker = self._breakers.get(service_id)
+        if breaker is None:
+            breaker = self._breakers[service_id] = _Breaker()
+        breaker.failures += 1
+        if settings.CIRCUIT_BREAKER_ENABLED and breaker.failures >= settings.CIRCUIT_FAILURE_THRESHOLD:
+            backoff = min(settings.CIRCUIT_MAX_BACKOFF, settings.CIRCUIT_BASE_BACKOFF * 2 ** breaker.opened)
+            breaker.opened += 1
+            breaker.open_until = (time.monotonic() if now is None else now) + backoff
+
+    def forget(self, service_id: str):
+        self._latencies.pop(service_id, None)
+        self._breakers.pop(service_id, None)
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        return {
+            "tracked_services": len(self._latencies),
+            "failing_services": len(self._breakers),
+            "open_circuits": [
+                {
+                    "service_id": service_id,
+                    "consecutive_failures": breaker.failures,
+                    "retry_in_s": round(breaker.open_until - now, 1)
+                }
+                for service_id, breaker in self._breakers.items()
+                if breaker.open_until > now
+            ]
+        }
+
+probe_policy = ProbePolicy()
@@ -0,0 +1,34 @@
+from typing import Dict, Iterable, List, Optional
+
+def parse_fields(fields: Optional[str], allowed: List[str], presets: Dict[str, List[str]]) -> List[str]:
+    """
+    Resolve a ``fields=`` value into response keys.
+
+    Accepts a comma-separated list of top-level response keys and/or preset
+    names (such as ``summary``). An empty value means every key. Raises
+    ValueError on unknown keys.
+    """
+    if not fields:
+        return list(allowed)
+
+    keys: List[str] = []
+    for name in (part.strip() for part in fields.split(",")):
+        if not name:
+            continue
+        expanded = presets.get(name, [name])
+        for key in expanded:
+            if key not in allowed:
+                raise ValueError(f"Unknown field '{key}'; allowed: {', '.join(allowed)}")
+            if key not in keys:
+                keys.append(key)
+    return keys or list(allowed)
+
+def mongo_projection(keys: Iterable[str], always: Iterable[str] = ()) -> Dict[str, int]:
+    """
+    Projection returning only the stored fields behind ``keys`` (``id`` maps
+    to ``_id``), plus ``always`` fields needed server-side such as sort keys.
+    """
+    projection = {"_id": 0}
+    for key in list(keys) + list(always):
+        projection["_id" if key in ("id", "_id") else key] = 1
+    return projection
@@ -0,0 +1,69 @@
+from typing import Any, Dict, List, Optional, Tuple, Type
+from beanie import Document
+from src.models.status import Status
+from src.models.error_log import ErrorLog
+
+SortSpec = List[Tuple[str, int]]
+
+# Representative shapes of the list queries issued by the routes
+LIST_QUERIES: List[Tuple[str, Type[Document], Dict[str, Any], SortSpec]] = [
+    ("status_logs", Status, {}, [("timestamp", -1), ("_id", -1)]),
+    ("status_logs_by_service", Status, {"service_id": "000000000000000000000000"}, [("timestamp", -1), ("_id", -1)]),
+    ("error_logs", ErrorLog, {}, [("timestamp", -1), ("_id", -1)]),
+    ("error_logs_by_severity", ErrorLog, {"severity": "critical"}, [("timestamp", -1), ("_id", -1)]),
+    ("error_logs_by_status", ErrorLog, {"status": "new"}, [("timestamp", -1), ("_id", -1)]),
+    ("error_logs_by_platform", ErrorLog, {"deviceInfo.platform": "ios"}, [("timestamp", -1), ("_id", -1)]),
+    ("error_logs_by_environment", ErrorLog, {"appInfo.environment": "production"}, [("timestamp", -1), ("_id", -1)]),
+    ("error_logs_by_assignee", ErrorLog, {"assignedTo": "nobody"}, [("timestamp", -1), ("_id", -1)]),
+    ("error_logs_by_message_prefix", ErrorLog, {"messageKey": {"$regex": "^typeerror"}}, [("messageKey", 1), ("timestamp", -1), ("_id", -1)])
+]
+
+async def explain_query(
+    model: Type[Document],
+    filters: Dict[str, Any],
+    sort: Optional[SortSpec] = None,
+    limit: int = 20
+) -> Dict[str, Any]:
+    """Run explain() for a find query against the model's collection"""
+    cursor = model.get_motor_collection().find(filters)
+    if sort:
+        cursor = cursor.sort(sort)
+    return await cursor.limit(limit).explain()
+
+def plan_stages(explain_output: Dict[str, Any]) -> List[str]:
+    """Collect the stage names of the winning plan, outermost first"""
+    winning_plan = explain_output.get("queryPlanner", {}).get("winningPlan", {})
+    # The slot-based engine nests the classic plan under queryPlan
+    winning_plan = winning_plan.get("queryPlan", winning_plan)
+
+    stages = []
+    pending = [winning_plan]
+    while pending:
+        stage = pending.pop(0)
+        if "stage" in stage:
+            stages.append(stage["stage"])
+        if "inputStage" in stage:
+            pending.append(stage["inputStage"])
+        pending.extend(stage.get("inputStages", []))
+    return stages
+
+async def assert_uses_index(
+    model: Type[Document],
+    filters: Dict[str, Any],
+    sort: Optional[SortSpec] = None
+) -> List[str]:
+    """Raise AssertionError if the query plan scans the whole collection"""
+    stages = plan_stages(await explain_query(model, filters, sort))
+    if "COLLSCAN" in stages:
+        raise AssertionError(f"Query {filters} sorted by {sort} uses a COLLSCAN: {stages}")
+    return stages
+
+async def check_list_query_plans() -> Dict[str, List[str]]:
+    """Explain every list query and warn about the ones not using an index"""
+    plans = {}
+    for name, model, filters, sort in LIST_QUERIES:
+        stages = plan_stages(await explain_query(model, filters, sort))
+        plans[name] = stages
+        if "COLLSCAN" in stages or "SORT" in stages:
+            print(f"Query plan warning for {name}: {' <- '.join(stages)}")
+    return plans
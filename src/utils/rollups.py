@@ -0,0 +1,138 @@
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from pymongo import UpdateOne
+from src.models.status import Status
+from src.models.status_rollup import StatusRollup
+from src.utils.latency_histogram import bucket_index, histogram_percentile
+from src.config import settings
+
+GRANULARITIES: Dict[str, timedelta] = {
+    "minute": timedelta(minutes=1),
+    "hour": timedelta(hours=1),
+    "day": timedelta(days=1)
+}
+
+STATUS_TTL_INDEX = "timestamp_ttl"
+
+def bucket_start(timestamp: datetime, granularity: str) -> datetime:
+    if granularity == "minute":
+        return timestamp.replace(second=0, microsecond=0)
+    if granularity == "hour":
+        return timestamp.replace(minute=0, second=0, microsecond=0)
+    return timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
+
+def retention(granularity: str) -> Optional[timedelta]:
+    """How long buckets of a granularity are kept; None means forever"""
+    days = {
+        "minute": settings.ROLLUP_MINUTE_RETENTION_DAYS,
+        "hour": settings.ROLLUP_HOUR_RETENTION_DAYS,
+        "day": settings.ROLLUP_DAY_RETENTION_DAYS
+    }[granularity]
+    return timedelta(days=days) if days > 0 else None
+
+async def record_rollups(statuses: Iterable[Status]):
+    """
+    Fold a batch of newly written Status records into minute, hour and day
+    buckets with one unordered bulk upsert.
+    """
+    increments: Dict[Tuple[str, str, datetime], Dict[str, Any]] = {}
+
+    for status in statuses:
+        for granularity in GRANULARITIES:
+            key = (status.service_id, granularity, bucket_start(status.timestamp, granularity))
+            bucket = increments.setdefault(key, {"inc": {"count": 0, "up": 0, "down": 0}, "min": None, "max": None})
+            inc = bucket["inc"]
+            inc["count"] += 1
+            if status.status == "up":
+                inc["up"] += 1
+                inc["latency_sum"] = inc.get("latency_sum", 0.0) + status.latency_ms
+                histogram_field = f"latency_histogram.{bucket_index(status.latency_ms)}"
+                inc[histogram_field] = inc.get(histogram_field, 0) + 1
+                bucket["min"] = status.latency_ms if bucket["min"] is None else min(bucket["min"], status.latency_ms)
+                bucket["max"] = status.latency_ms if bucket["max"] is None else max(bucket["max"], status.latency_ms)
+            else:
+                inc["down"] += 1
+
+    if not increments:
+        return
+
+    operations = []
+    for (service_id, granularity, start), bucket in increments.items():
+        keep_for = retention(granularity)
+        update: Dict[str, Any] = {
+            "$inc": bucket["inc"],
+            "$setOnInsert": {
+                "expires_at": start + GRANULARITIES[granularity] + keep_for if keep_for else None
+            }
+        }
+        if bucket["min"] is not None:
+            update["$min"] = {"latency_min": bucket["min"]}
+            update["$max"] = {"latency_max": bucket["max"]}
+        operations.append(UpdateOne(
+            {"service_id": service_id, "granularity": granularity, "bucket_start": start},
+            update,
+            upsert=True
+        ))
+
+    await StatusRollup.get_motor_collection().bulk_write(operations, ordered=False)
+
+def choose_granularity(start: datetime, end: datetime) -> str:
+    """
+    Pick the finest granularity that covers the range in at most
+    ROLLUP_MAX_POINTS buckets and is still retained for the range start,
+    falling back to the coarsest one.
+    """
+    now = datetime.now()
+    for granularity, width in GRANULARITIES.items():
+        keep_for = retention(granularity)
+        if keep_for is not None and start < now - keep_for:
+            continue
+        if (end - start) / width <= settings.ROLLUP_MAX_POINTS:
+            return granularity
+    return "day"
+
+def summarize_rollup(rollup: StatusRollup) -> Dict[str, Any]:
+    return {
+        "bucket_start": rollup.bucket_start.isoformat(),
+        "count": rollup.checks,
+        "up": rollup.up,
+        "down": rollup.down,
+        "uptime_pct": round(rollup.up / rollup.checks * 100, 3) if rollup.checks else None,
+        "latency_min": rollup.latency_min,
+        "latency_avg": round(rollup.latency_sum / rollup.up, 2) if rollup.up else None,
+        "latency_max": rollup.latency_max,
+        "latency_p50": histogram_percentile(rollup.latency_histogram, 0.50),
+        "latency_p95": histogram_percentile(rollup.latency_histogram, 0.95),
+        "latency_p99": histogram_percentile(rollup.latency_histogram, 0.99)
+    }
+
+async def find_rollups(service_id: str, granularity: str, start: datetime, end: datetime) -> List[StatusRollup]:
+    return await StatusRollup.find({
+        "service_id": service_id,
+        "granularity": granularity,
+        "bucket_start": {"$gte": bucket_start(start, granularity), "$lt": end}
+    }).sort("bucket_start").to_list()
+
+async def ensure_status_retention():
+    """
+    Create, retune or drop the TTL index that expires raw Status rows after
+    STATUS_RETENTION_DAYS (0 keeps them forever). Timestamps are stored as
+    naive local times, which MongoDB compares as UTC.
+    """
+    collection = Status.get_motor_collection()
+    indexes = await collection.index_information()
+    existing = indexes.get(STATUS_TTL_INDEX)
+
+    if settings.STATUS_RETENTION_DAYS <= 0:
+        if existing:
+            await collection.drop_index(STATUS_TTL_INDEX)
+        return
+
+    expire_after = int(settings.STATUS_RETENTION_DAYS * 86400)
+    if existing is None:
+        await collection.create_index([("timestamp", 1)], name=STATUS_TTL_INDEX, expireAfterSeconds=expire_after)
+    elif existing.get("expireAfterSeconds") != expire_after:
+        await collection.database.command({
+            "collMod": collection.name,
+            "index": {"name": STATUS_TTL_INDEX, "expireAfterSeconds": expire_after}
+        })
@@ -0,0 +1,101 @@
+import time
+from typing import Any, Dict, Optional, Tuple
+from src.config import settings
+
+class _WindowCounter:
+    __slots__ = ("window_start", "current", "previous", "overflow")
+
+    def __init__(self, window_start: float):
+        self.window_start = window_start
+        self.current = 0
+        self.previous = 0
+        self.overflow = 0
+
+class ErrorSampler:
+    """
+    Per-(fingerprint, severity) sampling of error-log storms.
+
+    Occurrences are counted with a sliding-window estimate (the previous
+    fixed window weighted by how much of it still overlaps, plus the current
+    one). While the estimate is below a severity's ``keep_first`` every
+    occurrence is kept; past it only every ``keep_every``-th one is, and the
+    kept document records that it stands for ``keep_every`` occurrences.
+    ``keep_every`` of 0 drops everything past the limit.
+    """
+
+    def __init__(
+        self,
+        rules: Optional[Dict[str, Dict[str, int]]] = None,
+        window: Optional[float] = None,
+        max_keys: Optional[int] = None
+    ):
+        self.rules = settings.ERROR_SAMPLING_RULES if rules is None else rules
+        self.window = window or settings.ERROR_SAMPLING_WINDOW
+        self.max_keys = max_keys or settings.ERROR_SAMPLING_MAX_KEYS
+        self._counters: Dict[Tuple[str, str], _WindowCounter] = {}
+        self._kept = 0
+        self._sampled_out = 0
+
+    def decide(self, fingerprint: str, severity: str, now: Optional[float] = None) -> Optional[float]:
+        """Return the sample rate to store the occurrence with, or None to drop it"""
+        rule = self.rules.get(severity)
+        if not rule:
+            self._kept += 1
+            return 1.0
+
+        now = time.monotonic() if now is None else now
+        counter = self._counter((fingerprint, severity), now)
+        elapsed = (now - counter.window_start) / self.window
+        estimate = counter.previous * (1 - elapsed) + counter.current
+        counter.current += 1
+
+        if estimate < rule.get("keep_first", 0):
+            self._kept += 1
+            return 1.0
+
+        keep_every = rule.get("keep_every", 1)
+        counter.overflow += 1
+        if keep_every > 0 and counter.overflow % keep_every == 0:
+            self._kept += 1
+            return float(keep_every)
+
+        self._sampled_out += 1
+        return None
+
+    def always_keeps(self, severity: str) -> bool:
+        """Whether every occurrence of this severity is kept, however many arrive"""
+        rule = self.rules.get(severity)
+        return not rule or rule.get("keep_every", 1) == 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "tracked_keys": len(self._counters),
+            "kept": self._kept,
+            "sampled_out": self._sampled_out
+        }
+
+    def _counter(self, key: Tuple[str, str], now: float) -> _WindowCounter:
+        counter = self._counters.get(key)
+        if counter is None:
+            if len(self._counters) >= self.max_keys:
+                self._prune(now)
+            counter = self._counters[key] = _WindowCounter(now)
+            return counter
+
+        windows_passed = int((now - counter.window_start) // self.window)
+        if windows_passed >= 1:
+            counter.previous = counter.current if windows_passed == 1 else 0
+            counter.current = 0
+            counter.window_start += windows_passed * self.window
+        return counter
+
+    def _prune(self, now: float):
+        """Forget keys idle for two windows, or the oldest half if none are"""
+        stale = [key for key, counter in self._counters.items() if now - counter.window_start >= 2 * self.window]
+        if not stale:
+            by_age = sorted(self._counters, key=lambda key: self._counters[key].window_start)
+            stale = by_age[:len(by_age) // 2 or 1]
+        for key in stale:
+            del self._counters[key]
+
+error_sampler = ErrorSampler()
@@ -0,0 +1,199 @@
+import asyncio
+import heapq
+import random
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+from src.models.service import Service
+from src.utils.probe_engine import get_check_interval, probe_service, status_from_result
+from src.utils.probe_policy import probe_policy
+from src.utils.status_buffer import status_buffer
+from src.utils.service_registry import service_registry
+from src.utils.sharding import shard_manager
+from src.config import settings
+
+class HealthCheckScheduler:
+    """
+    In-process scheduler that probes every service on its own interval.
+
+    Each service gets a slot in a min-heap keyed by its next due time. First
+    checks are spread uniformly over one interval and every reschedule adds
+    jitter, so probes do not arrive in bursts. A tick is skipped when the
+    previous probe of the same service is still running, and a service whose
+    circuit is open is pushed back to when its backoff ends. With sharding
+    enabled only services in this worker's leased shards are scheduled.
+
+    The scheduler is off by default (SCHEDULER_ENABLED). Without sharding
+    every worker that enables it probes every service, so with several
+    workers enable it in only one of them.
+    """
+
+    def __init__(self, concurrency: Optional[int] = None, jitter: Optional[float] = None):
+        self.concurrency = concurrency or settings.SCHEDULER_CONCURRENCY
+        self.jitter = settings.SCHEDULER_JITTER if jitter is None else jitter
+
+        self._services: Dict[str, Service] = {}
+        self._heap: List[Tuple[float, int, str]] = []
+        self._scheduled: Set[str] = set()
+        self._sequence = 0
+        self._in_flight: Set[str] = set()
+        self._waiting = 0
+        self._probe_tasks: Set[asyncio.Task] = set()
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+
+        self._dispatched = 0
+        self._skipped = 0
+        self._circuit_skipped = 0
+        self._last_lag_ms = 0.0
+        self._max_lag_ms = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self):
+        """Load the service list and start the scheduling loop"""
+        if self.running:
+            return
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._wakeup = asyncio.Event()
+        await self.refresh_services()
+        self._task = asyncio.create_task(self._run())
+        self._refresh_task = asyncio.create_task(self._refresh_loop())
+        shard_manager.add_listener(self.refresh_services)
+
+    async def stop(self):
+        """Stop scheduling and cancel probes that are still running"""
+        shard_manager.remove_listener(self.refresh_services)
+        tasks = [task for task in (self._task, self._refresh_task) if task is not None]
+        tasks.extend(self._probe_tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+        self._refresh_task = None
+        self._probe_tasks.clear()
+        self._in_flight.clear()
+        self._waiting = 0
+
+    def set_services(self, services: List[Service]):
+        """Replace the scheduled service set, keeping due times of known services"""
+        now = time.monotonic()
+        previous = self._services
+        self._services = {str(service.id): service for service in services}
+
+        for service_id, service in self._services.items():
+            # A service dropped and re-added before its old entry came due keeps that entry
+            if service_id not in previous and service_id not in self._scheduled:
+                self._push(now + random.uniform(0, get_check_interval(service)), service_id)
+
+        # Entries of removed services are dropped lazily when they come due
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def refresh_services(self):
+        """Pick up this worker's share of the service list from the registry cache"""
+        services = await service_registry.all()
+        self.set_services([service for service in services if shard_manager.owns_service(str(service.id))])
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, lag and counters describing how well the scheduler keeps up"""
+        now = time.monotonic()
+        overdue = sum(1 for due, _, service_id in self._heap if due <= now and service_id in self._services)
+        oldest_due = min((due for due, _, service_id in self._heap if service_id in self._services), default=None)
+        current_lag_ms = max(0.0, (now - oldest_due) * 1000) if oldest_due is not None else 0.0
+
+        return {
+            "running": self.running,
+            "services": len(self._services),
+            "queue_depth": overdue + self._waiting,
+            "waiting_for_slot": self._waiting,
+            "in_flight": len(self._in_flight),
+            "current_lag_ms": round(current_lag_ms, 2),
+            "last_lag_ms": round(self._last_lag_ms, 2),
+            "max_lag_ms": round(self._max_lag_ms, 2),
+            "dispatched": self._dispatched,
+            "skipped_ticks": self._skipped,
+            "circuit_skipped_ticks": self._circuit_skipped
+        }
+
+    def _push(self, due: float, service_id: str):
+        self._sequence += 1
+        self._scheduled.add(service_id)
+        heapq.heappush(self._heap, (due, self._sequence, service_id))
+
+    def _next_due(self, previous_due: float, service: Service) -> float:
+        interval = get_check_interval(service)
+        spread = interval * self.jitter
+        next_due = previous_due + interval + random.uniform(-spread, spread)
+        # Do not try to catch up on missed ticks after a stall
+        return max(next_due, time.monotonic())
+
+    async def _refresh_loop(self):
+        while True:
+            await asyncio.sleep(settings.SCHEDULER_REFRESH_INTERVAL)
+            try:
+                await self.refresh_services()
+            except Exception as e:
+                print(f"Scheduler failed to refresh services: {str(e)}")
+
+    async def _run(self):
+        while True:
+            now = time.monotonic()
+
+            while self._heap and self._heap[0][0] <= now:
+                due, _, service_id = heapq.heappop(self._heap)
+                service = self._services.get(service_id)
+                # Lost leases take effect here, before the next refresh drops the service
+                if service is None or not shard_manager.owns_service(service_id):
+                    # Forget the service too, so a refresh after the lease is regained adds it back
+                    self._services.pop(service_id, None)
+                    self._scheduled.discard(service_id)
+                    continue
+
+                retry_at = probe_policy.retry_at(service_id, now)
+                if retry_at is not None:
+                    self._circuit_skipped += 1
+                    self._push(retry_at, service_id)
+                    continue
+
+                if service_id in self._in_flight:
+                    self._skipped += 1
+                else:
+                    self._in_flight.add(service_id)
+                    self._waiting += 1
+                    task = asyncio.create_task(self._probe(service, due))
+                    self._probe_tasks.add(task)
+                    task.add_done_callback(self._probe_tasks.discard)
+
+                self._push(self._next_due(due, service), service_id)
+
+            self._wakeup.clear()
+            timeout = self._heap[0][0] - time.monotonic() if self._heap else None
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _probe(self, service: Service, due: float):
+        service_id = str(service.id)
+        try:
+            async with self._semaphore:
+                self._waiting -= 1
+                lag_ms = (time.monotonic() - due) * 1000
+                self._last_lag_ms = lag_ms
+                self._max_lag_ms = max(self._max_lag_ms, lag_ms)
+                self._dispatched += 1
+
+                status_data = await probe_service(service)
+                status_buffer.add(status_from_result({"service_id": service_id, **status_data}))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Scheduled check for service {service_id} failed: {str(e)}")
+        finally:
+            self._in_flight.discard(service_id)
+
+scheduler = HealthCheckScheduler()
@@ -0,0 +1,57 @@
+import re
+from typing import Any, Dict, List, Tuple
+from pymongo import ASCENDING, DESCENDING, UpdateOne
+from src.models.error_log import ErrorLog
+
+MESSAGE_KEY_LENGTH = 200
+BACKFILL_BATCH_SIZE = 1000
+
+TEXT_SCORE = {"$meta": "textScore"}
+TEXT_SORT = [("score", TEXT_SCORE)]
+# Index order of the messageKey index, so prefix matches come back without a SORT stage
+PREFIX_SORT = [("messageKey", ASCENDING), ("timestamp", DESCENDING), ("_id", DESCENDING)]
+
+def message_search_key(message: str) -> str:
+    """Lowercased, whitespace-collapsed message prefix used for typeahead"""
+    return " ".join(message.lower().split())[:MESSAGE_KEY_LENGTH]
+
+def text_search(query: str) -> Tuple[Dict[str, Any], Dict[str, Any], List[Tuple[str, Any]]]:
+    """Filter, extra projection and sort for a relevance-ranked full-text search"""
+    return {"$text": {"$search": query}}, {"score": TEXT_SCORE}, TEXT_SORT
+
+def prefix_search(query: str) -> Tuple[Dict[str, Any], Dict[str, Any], List[Tuple[str, Any]]]:
+    """
+    Filter, extra projection and sort for a message-prefix (typeahead) search.
+
+    An anchored regex on the lowercased messageKey turns into index bounds,
+    so the scan stops once a page is filled.
+    """
+    prefix = message_search_key(query)
+    return {"messageKey": {"$regex": f"^{re.escape(prefix)}"}}, {}, PREFIX_SORT
+
+def search_query(query: str, mode: str) -> Tuple[Dict[str, Any], Dict[str, Any], List[Tuple[str, Any]]]:
+    """Filter, extra projection and sort for a search in the given mode ('text' or 'prefix')"""
+    return text_search(query) if mode == 'text' else prefix_search(query)
+
+async def backfill_message_keys() -> int:
+    """
+    Set messageKey on error logs stored before it existed. Keys are computed
+    with message_search_key itself so they collapse whitespace exactly like
+    the keys of new logs and of prefix queries.
+    """
+    collection = ErrorLog.get_motor_collection()
+    modified = 0
+    operations: List[UpdateOne] = []
+
+    async for document in collection.find({"messageKey": None}, {"message": 1}):
+        operations.append(UpdateOne(
+            {"_id": document["_id"]},
+            {"$set": {"messageKey": message_search_key(document.get("message") or "")}}
+        ))
+        if len(operations) >= BACKFILL_BATCH_SIZE:
+            modified += (await collection.bulk_write(operations, ordered=False)).modified_count
+            operations = []
+
+    if operations:
+        modified += (await collection.bulk_write(operations, ordered=False)).modified_count
+    return modified
@@ -0,0 +1,33 @@
+from typing import Any, Dict, Iterable, List, Optional, Type
+import orjson
+from bson import ObjectId
+from fastapi import Response
+from pydantic import BaseModel
+
+def _default(value: Any) -> Any:
+    if isinstance(value, ObjectId):
+        return str(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+def dumps(content: Any) -> bytes:
+    """Encode plain Python data (including raw Mongo documents) straight to JSON bytes"""
+    return orjson.dumps(content, default=_default)
+
+def json_response(content: Any, status_code: int = 200, headers: Optional[Dict[str, str]] = None) -> Response:
+    """A JSON response that skips FastAPI's response_model validation and encoding"""
+    return Response(content=dumps(content), status_code=status_code, headers=headers, media_type="application/json")
+
+def response_keys(model: Type[BaseModel]) -> List[str]:
+    """Output keys of a response model, using aliases like FastAPI does"""
+    return [field.alias or name for name, field in model.model_fields.items()]
+
+def document_to_response(document: Dict[str, Any], keys: Iterable[str]) -> Dict[str, Any]:
+    """
+    Shape a raw Mongo document like a response model: ``_id`` becomes ``id``
+    and only the model's keys are kept, missing ones as None. Datetimes are
+    left for orjson, which writes the same ISO format as ``isoformat()``.
+    """
+    item = {key: document.get(key) for key in keys}
+    if "id" in item:
+        item["id"] = str(document["_id"])
+    return item
@@ -0,0 +1,110 @@
+import asyncio
+from typing import Any, Dict, List, Optional
+from src.models.service import Service
+from src.utils.versions import bump_version, get_version
+from src.config import settings
+
+SERVICES_COLLECTION = "services"
+
+def service_to_dict(service: Service) -> Dict[str, Any]:
+    """Response-shaped dict of a service, as the services routes return it"""
+    return {
+        "id": str(service.id),
+        "name": service.name,
+        "url": service.url,
+        "metadata": service.metadata,
+        "check_interval": service.check_interval,
+        "check_timeout": service.check_timeout,
+        "created_at": service.created_at.isoformat(),
+        "updated_at": service.updated_at.isoformat()
+    }
+
+class ServiceRegistry:
+    """
+    Process-level cache of the service list.
+
+    Loaded at startup and updated in place by this process's write handlers.
+    Every write also bumps the ``services`` collection version, and a
+    background poll reloads the cache when the version moves, so changes made
+    by other workers or instances show up within SERVICE_REGISTRY_POLL_INTERVAL.
+    """
+
+    def __init__(self, poll_interval: Optional[float] = None):
+        self.poll_interval = poll_interval or settings.SERVICE_REGISTRY_POLL_INTERVAL
+        self._services: Dict[str, Service] = {}
+        self._dicts: Dict[str, Dict[str, Any]] = {}
+        self._version: Optional[int] = None
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def version(self) -> Optional[int]:
+        return self._version
+
+    async def start(self):
+        await self.load()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._poll())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def load(self):
+        """Reload every service from the database"""
+        async with self._lock:
+            # Read the version first so a write racing the reload is picked up next poll
+            version = await get_version(SERVICES_COLLECTION)
+            services = await Service.find_all().to_list()
+            self._services = {str(service.id): service for service in services}
+            self._dicts = {service_id: service_to_dict(service) for service_id, service in self._services.items()}
+            self._version = version
+
+    async def all(self) -> List[Service]:
+        if self._version is None:
+            await self.load()
+        return list(self._services.values())
+
+    async def all_dicts(self) -> List[Dict[str, Any]]:
+        if self._version is None:
+            await self.load()
+        return list(self._dicts.values())
+
+    async def get(self, service_id: str) -> Optional[Service]:
+        if self._version is None:
+            await self.load()
+        return self._services.get(service_id)
+
+    async def upsert(self, service: Service):
+        """Record a service this process just created or updated"""
+        service_id = str(service.id)
+        self._services[service_id] = service
+        self._dicts[service_id] = service_to_dict(service)
+        await self._bump()
+
+    async def remove(self, service_id: str):
+        """Record a service this process just deleted"""
+        self._services.pop(service_id, None)
+        self._dicts.pop(service_id, None)
+        await self._bump()
+
+    async def _bump(self):
+        version = await bump_version(SERVICES_COLLECTION)
+        if self._version is not None and version == self._version + 1:
+            self._version = version
+        else:
+            # Another writer changed the services since our last load
+            await self.load()
+
+    async def _poll(self):
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                if await get_version(SERVICES_COLLECTION) != self._version:
+                    await self.load()
+            except Exception as e:
+                print(f"Service registry refresh failed: {str(e)}")
+
+service_registry = ServiceRegistry()
@@ -0,0 +1,170 @@
+import asyncio
+import math
+import os
+import random
+import socket
+import time
+import uuid
+import zlib
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from src.models.lease import Lease
+from src.config import settings
+
+def shard_of(service_id: str, shard_count: int) -> int:
+    """Stable shard of a service, the same in every process"""
+    return zlib.crc32(service_id.encode()) % shard_count
+
+class ShardLeaseManager:
+    """
+    Splits scheduled health checks between workers with leases in MongoDB.
+
+    Services hash into SHARD_COUNT shards, each guarded by a lease with an
+    owner and an expiry. Every LEASE_RENEW_INTERVAL seconds a worker renews
+    its own liveness lease and its shard leases, gives up shards above its
+    fair share (shard count divided by live workers, rounded up) and takes
+    unowned or expired shards below it, so a dead worker's shards are picked
+    up within LEASE_TTL. Lease times are UTC; workers must have roughly
+    synchronized clocks.
+
+    If renewal fails for LEASE_TTL the worker stops claiming any service,
+    since other workers may have taken its shards by then. With sharding
+    disabled every service belongs to this worker.
+    """
+
+    def __init__(self, shard_count: Optional[int] = None):
+        self.shard_count = shard_count or settings.SHARD_COUNT
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.enabled = settings.SHARDING_ENABLED
+
+        self._owned: Set[int] = set()
+        self._valid_until = 0.0
+        self._live_workers = 0
+        self._listeners: List[Callable[[], Awaitable[Any]]] = []
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def owned_shards(self) -> Set[int]:
+        return set(self._owned) if time.monotonic() < self._valid_until else set()
+
+    def owns_service(self, service_id: str) -> bool:
+        if not self.enabled:
+            return True
+        return time.monotonic() < self._valid_until and shard_of(service_id, self.shard_count) in self._owned
+
+    def add_listener(self, listener: Callable[[], Awaitable[Any]]):
+        """Register a coroutine function called after the owned shard set changes"""
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[], Awaitable[Any]]):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    async def start(self):
+        """Claim a first set of shards, then keep the leases renewed in the background"""
+        if not self.enabled or self._task is not None:
+            return
+        await self.sync()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop renewing and release every lease so other workers take over at once"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        try:
+            await Lease.get_motor_collection().update_many(
+                {"owner": self.worker_id},
+                {"$set": {"owner": None, "expires_at": datetime.now(timezone.utc)}}
+            )
+        except Exception as e:
+            print(f"Failed to release shard leases: {str(e)}")
+        self._owned = set()
+
+    async def sync(self):
+        """Renew, rebalance and acquire leases once"""
+        started = time.monotonic()
+        now = datetime.now(timezone.utc)
+        expires_at = now + timedelta(seconds=settings.LEASE_TTL)
+        collection = Lease.get_motor_collection()
+
+        await self._acquire(f"worker:{self.worker_id}", "worker", None, now, expires_at)
+        self._live_workers = max(1, await collection.count_documents({"kind": "worker", "expires_at": {"$gt": now}}))
+        fair_share = math.ceil(self.shard_count / self._live_workers)
+
+        # A lease still naming this worker was not taken over, even if it lapsed
+        await collection.update_many({"kind": "shard", "owner": self.worker_id}, {"$set": {"expires_at": expires_at}})
+        owned = {
+            document["shard"]
+            async for document in collection.find({"kind": "shard", "owner": self.worker_id}, {"shard": 1})
+        }
+
+        if len(owned) > fair_share:
+            released = sorted(owned)[fair_share:]
+            await collection.update_many(
+                {"kind": "shard", "shard": {"$in": released}, "owner": self.worker_id},
+                {"$set": {"owner": None, "expires_at": now}}
+            )
+            owned -= set(released)
+
+        if len(owned) < fair_share:
+            held = {
+                document["shard"]
+                async for document in collection.find({"kind": "shard", "expires_at": {"$gt": now}}, {"shard": 1})
+            }
+            candidates = [shard for shard in range(self.shard_count) if shard not in held and shard not in owned]
+            # Random order keeps workers starting together from racing for the same shards
+            random.shuffle(candidates)
+            for shard in candidates:
+                if len(owned) >= fair_share:
+                    break
+                if await self._acquire(f"shard:{shard}", "shard", shard, now, expires_at):
+                    owned.add(shard)
+
+        # A lapsed lease counts as having owned nothing, so renewing the same
+        # shards after a lapse still reschedules their services
+        changed = owned != self.owned_shards
+        self._owned = owned
+        self._valid_until = started + settings.LEASE_TTL
+        if changed:
+            for listener in self._listeners:
+                await listener()
+
+    def stats(self) -> Dict[str, Any]:
+        owned = self.owned_shards
+        return {
+            "enabled": self.enabled,
+            "worker_id": self.worker_id,
+            "shard_count": self.shard_count,
+            "live_workers": self._live_workers,
+            "owned_shards": sorted(owned),
+            "lease_valid_for_s": round(max(0.0, self._valid_until - time.monotonic()), 1)
+        }
+
+    async def _acquire(self, name: str, kind: str, shard: Optional[int], now: datetime, expires_at: datetime) -> bool:
+        """Take or renew a lease that is ours, unowned or expired; False if another worker holds it"""
+        try:
+            document = await Lease.get_motor_collection().find_one_and_update(
+                {"name": name, "$or": [{"owner": self.worker_id}, {"owner": None}, {"expires_at": {"$lte": now}}]},
+                {"$set": {"kind": kind, "shard": shard, "owner": self.worker_id, "expires_at": expires_at}},
+                upsert=True,
+                return_document=ReturnDocument.AFTER
+            )
+        except DuplicateKeyError:
+            # The lease exists and is held by someone else, so the upsert collided
+            return False
+        return document is not None and document["owner"] == self.worker_id
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(settings.LEASE_RENEW_INTERVAL)
+            try:
+                await self.sync()
+            except Exception as e:
+                print(f"Failed to renew shard leases: {str(e)}")
+
+shard_manager = ShardLeaseManager()
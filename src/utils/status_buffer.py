@@ -0,0 +1,158 @@
+import asyncio
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List, Optional
+from beanie import PydanticObjectId
+from pymongo.errors import BulkWriteError
+from src.models.status import Status
+from src.utils.latest_status import record_latest_statuses
+from src.utils.rollups import record_rollups
+from src.utils.events import record_status
+from src.config import settings
+
+DUPLICATE_KEY_ERROR = 11000
+
+class StatusWriteBuffer:
+    """
+    Write-behind buffer that batches Status records into insert_many calls.
+
+    Records are flushed when ``batch_size`` of them are pending or every
+    ``flush_interval`` seconds, whichever comes first. At most ``max_pending``
+    records are held in memory; beyond that the overflow policy either drops
+    the oldest pending records (``drop_oldest``) or rejects new ones
+    (``drop_newest``). Ids are assigned on ``add`` so callers can return them
+    right away, which also makes retried batches idempotent.
+    """
+
+    def __init__(
+        self,
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+        max_pending: Optional[int] = None,
+        overflow_policy: Optional[str] = None
+    ):
+        self.batch_size = batch_size or settings.STATUS_BUFFER_BATCH_SIZE
+        self.flush_interval = flush_interval or settings.STATUS_BUFFER_FLUSH_INTERVAL
+        self.max_pending = max_pending or settings.STATUS_BUFFER_MAX_PENDING
+        self.overflow_policy = overflow_policy or settings.STATUS_BUFFER_OVERFLOW_POLICY
+        if self.overflow_policy not in ("drop_oldest", "drop_newest"):
+            raise ValueError(f"Unknown overflow policy: {self.overflow_policy}")
+
+        self._pending: Deque[Status] = deque()
+        self._flush_lock = asyncio.Lock()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+        self._written = 0
+        self._dropped = 0
+        self._failed_flushes = 0
+
+    def add(self, status: Status) -> bool:
+        """Queue a record for writing; returns False if it was dropped"""
+        if status.id is None:
+            status.id = PydanticObjectId()
+        record_status(status)
+
+        if len(self._pending) >= self.max_pending:
+            self._dropped += 1
+            if self.overflow_policy == "drop_newest":
+                return False
+            self._pending.popleft()
+
+        self._pending.append(status)
+        if len(self._pending) >= self.batch_size and self._wakeup is not None:
+            self._wakeup.set()
+        return True
+
+    def add_many(self, statuses: Iterable[Status]) -> int:
+        """Queue several records; returns how many were accepted"""
+        return sum(1 for status in statuses if self.add(status))
+
+    async def start(self):
+        if self._task is not None and not self._task.done():
+            return
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the flush loop and write out everything still pending"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        while self._pending:
+            if not await self.flush():
+                break
+
+    async def flush(self) -> bool:
+        """Write pending records in batches; returns False if a batch failed"""
+        async with self._flush_lock:
+            while self._pending:
+                batch = [self._pending.popleft() for _ in range(min(self.batch_size, len(self._pending)))]
+                try:
+                    failed = await self._write(batch)
+                except asyncio.CancelledError:
+                    # stop() cancelled a flush in progress; keep the batch for its final drain.
+                    # Ids are fixed, so rows that were already written come back as duplicates
+                    self._requeue(batch)
+                    raise
+                except Exception as e:
+                    failed = batch
+                    print(f"Failed to flush {len(batch)} status records: {str(e)}")
+                if failed:
+                    self._failed_flushes += 1
+                    self._requeue(failed)
+                    return False
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pending": len(self._pending),
+            "max_pending": self.max_pending,
+            "overflow_policy": self.overflow_policy,
+            "written": self._written,
+            "dropped": self._dropped,
+            "failed_flushes": self._failed_flushes
+        }
+
+    async def _write(self, batch: List[Status]) -> List[Status]:
+        """Insert a batch and return the records that need to be retried"""
+        failed: List[Status] = []
+        inserted = batch
+        try:
+            await Status.insert_many(batch, ordered=False)
+        except BulkWriteError as e:
+            write_errors = e.details.get("writeErrors", [])
+            # Duplicates come from a retried batch that was partly written before
+            failed = [
+                batch[error["index"]] for error in write_errors
+                if error.get("code") != DUPLICATE_KEY_ERROR
+            ]
+            errored = {error["index"] for error in write_errors}
+            inserted = [status for index, status in enumerate(batch) if index not in errored]
+
+        self._written += len(inserted)
+        try:
+            await record_latest_statuses(inserted)
+            await record_rollups(inserted)
+        except Exception as e:
+            # The records themselves are stored; do not retry them for a derived view
+            print(f"Failed to update status projections: {str(e)}")
+        return failed
+
+    def _requeue(self, batch: List[Status]):
+        room = self.max_pending - len(self._pending)
+        if room < len(batch):
+            self._dropped += len(batch) - max(room, 0)
+            batch = batch[len(batch) - max(room, 0):]
+        self._pending.extendleft(reversed(batch))
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+status_buffer = StatusWriteBuffer()
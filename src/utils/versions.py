@@ -0,0 +1,66 @@
+import asyncio
+import time
+from typing import Dict, Iterable, Optional
+from pymongo import ReturnDocument
+from src.models.collection_version import CollectionVersion
+from src.config import settings
+
+async def bump_version(collection: str) -> int:
+    """Increment and return a collection's version"""
+    document = await CollectionVersion.get_motor_collection().find_one_and_update(
+        {"collection": collection},
+        {"$inc": {"version": 1}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER
+    )
+    return document["version"]
+
+async def get_versions(collections: Iterable[str]) -> Dict[str, int]:
+    """Current versions of several collections in one query; unknown ones are 0"""
+    collections = list(collections)
+    versions = {collection: 0 for collection in collections}
+    cursor = CollectionVersion.get_motor_collection().find({"collection": {"$in": collections}})
+    async for document in cursor:
+        versions[document["collection"]] = document["version"]
+    return versions
+
+async def get_version(collection: str) -> int:
+    return (await get_versions([collection]))[collection]
+
+class VersionBumper:
+    """
+    Coalesces version bumps from hot write paths.
+
+    ``touch`` never waits and never raises: it schedules at most one bump per
+    collection per ``interval``, so a burst of writes costs one round trip to
+    the shared version document instead of one each. Readers may see the old
+    version for up to ``interval`` seconds after a write.
+    """
+
+    def __init__(self, interval: Optional[float] = None):
+        self.interval = settings.VERSION_BUMP_INTERVAL if interval is None else interval
+        self._last_bump: Dict[str, float] = {}
+        self._pending: Dict[str, asyncio.Task] = {}
+
+    def touch(self, collection: str):
+        """Schedule a bump of the collection's version unless one is already pending"""
+        if collection in self._pending:
+            return
+        delay = self._last_bump.get(collection, float("-inf")) + self.interval - time.monotonic()
+        self._pending[collection] = asyncio.create_task(self._bump_later(collection, max(0.0, delay)))
+
+    async def _bump_later(self, collection: str, delay: float):
+        try:
+            if delay > 0:
+                await asyncio.sleep(delay)
+        finally:
+            # Writes from here on need a bump of their own
+            self._pending.pop(collection, None)
+
+        self._last_bump[collection] = time.monotonic()
+        try:
+            await bump_version(collection)
+        except Exception as e:
+            print(f"Failed to bump version of {collection}: {str(e)}")
+
+version_bumper = VersionBumper()